@@ -6,8 +6,9 @@ Music commands - thin layer delegating to services
 import asyncio
 import logging
 import os
+import re
 import time
-from typing import Optional
+from typing import Dict, Optional
 
 import discord
 from discord.ext import commands
@@ -16,7 +17,7 @@ import config
 from models.song import Song
 from services.extractor import ExtractorService
 from services.queue import QueueService
-from services.player import PlayerService
+from services.player import PlayerService, PlaybackState
 from utils.database import RedisManager
 from utils.cache import GuildCache
 from utils.lyrics import LyricsProvider
@@ -28,6 +29,18 @@ from .embeds import EmbedBuilder
 
 logger = logging.getLogger('music_bot')
 
+# Request-channel URL detection (compiled once, used on every message)
+URL_PATTERN = re.compile(r'https?://\S+')
+REQUEST_CHANNEL_HOSTS = ('youtube.com', 'youtu.be', 'spotify.com')
+
+# Audio filters in display order, plus a set for membership checks
+AUDIO_FILTERS = ('off', 'nightcore', 'vaporwave', 'bassboost', '8d', 'karaoke')
+VALID_FILTERS = frozenset(AUDIO_FILTERS)
+
+# Lyrics are split into embed-description-sized pages, at most a few sent
+LYRICS_PAGE_SIZE = 4096
+LYRICS_MAX_PAGES = 3
+
 
 class MusicCommands(commands.Cog):
     """Music commands cog"""
@@ -35,73 +48,128 @@ class MusicCommands(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.logger = logger
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         
         # Initialize services
         self.db = RedisManager(host=os.getenv('REDIS_HOST', 'redis'))
         self.queue_service = QueueService(self.db)
         self.extractor = ExtractorService()
         self.player = PlayerService(bot, self.queue_service, self.extractor)
+        self.player.on_queue_empty = self._autoplay_fill
         
         # Utilities
         self.cache = GuildCache()
         self.lyrics_provider = LyricsProvider()
+        
+        # Static embeds, built once
+        self._playlist_help_embed = EmbedBuilder.playlist_help()
+        # Detailed now playing embed per guild, refreshed in place
+        self._np_embeds: Dict[int, discord.Embed] = {}
+        # Last queue listing per guild as (queue_version, page, embed), resent while the queue is unchanged
+        self._queue_embeds: Dict[int, tuple] = {}
+        # Control view on each guild's latest now playing message
+        self._active_views: Dict[int, MusicControlView] = {}
+        
+        # Background work (playlist tails); bounded so playlist spam can't pile up extractors
+        self._background_sem = asyncio.Semaphore(config.MAX_BACKGROUND_LOADS)
+        self._background_tasks: set = set()
+    
+    def _spawn_background(self, coro):
+        """Run a coroutine in the background, at most MAX_BACKGROUND_LOADS at a time"""
+        async def runner():
+            async with self._background_sem:
+                await coro
+        
+        def done(task):
+            self._background_tasks.discard(task)
+            # A runner cancelled while queued on the semaphore never started coro; close it so it
+            # isn't reported as never awaited (a no-op for a coro that ran to completion)
+            coro.close()
+        
+        task = asyncio.create_task(runner())
+        # Keep a strong reference until the task finishes
+        self._background_tasks.add(task)
+        task.add_done_callback(done)
+        return task
+    
+    def _retire_view(self, view: MusicControlView):
+        """Strip a superseded view's buttons without holding up the caller"""
+        task = asyncio.create_task(view.retire())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    def cog_unload(self):
+        for task in self._background_tasks:
+            task.cancel()
+        for view in self._active_views.values():
+            view.stop()
+        self.extractor.close()
+    
+    async def _ensure_voice(self, ctx, channel: discord.VoiceChannel) -> Optional[discord.VoiceClient]:
+        """Connect to or move into the given channel, return the voice client"""
+        vc = ctx.voice_client
+        if not vc:
+            return await self.player.connect(channel)
+        if vc.channel != channel:
+            await vc.move_to(channel)
+        return vc
     
-    def _after_play(self, guild_id: int):
-        """Create after callback for playback"""
-        def callback(error):
-            if error:
-                self.logger.error(f"Player error: {error}")
-            # Schedule next song
-            asyncio.run_coroutine_threadsafe(
-                self._play_next_async(guild_id),
-                self.bot.loop
-            )
-        return callback
-    
-    async def _play_next_async(self, guild_id: int):
-        """Async wrapper to play next song"""
-        success = await self.player.play_next(guild_id, self._after_play(guild_id))
+    async def _autoplay_fill(self, guild_id: int) -> bool:
+        """Queue recommendations when the queue runs dry, return True if songs were added"""
+        if not self.queue_service.get_autoplay(guild_id):
+            return False
         
-        if not success:
-            # Queue is empty - check if autoplay is enabled
-            if self.queue_service.get_autoplay(guild_id):
-                current = self.queue_service.get_current(guild_id)
-                if current:
-                    self.logger.info(f"Auto-play: fetching recommendations for {current.title}")
-                    related = await self.extractor.get_related_songs(current, limit=3)
-                    if related:
-                        self.queue_service.add_many(guild_id, related)
-                        # Try playing again
-                        success = await self.player.play_next(guild_id, self._after_play(guild_id))
-                        if success:
-                            return
-            
-            self.queue_service.clear_now_playing_message(guild_id)
+        current = self.queue_service.get_current(guild_id)
+        if not current:
+            return False
+        
+        self.logger.info(f"Auto-play: fetching recommendations for {current.title}")
+        related = await self.extractor.get_related_songs(current, limit=3)
+        if not related:
+            return False
+        
+        self.queue_service.add_many(guild_id, related)
+        return True
     
-    async def _send_now_playing(self, ctx, song: Song):
+    async def _send_now_playing(self, channel: discord.abc.Messageable, guild_id: int, song: Song):
         """Send now playing embed with controls"""
         embed = EmbedBuilder.now_playing(song)
         view = MusicControlView(self)
-        view.update_buttons(ctx.guild.id)
-        message = await ctx.send(embed=embed, view=view)
+        view.update_buttons(guild_id)
+        message = await channel.send(embed=embed, view=view)
         view.message = message
-        self.queue_service.set_now_playing_message(ctx.guild.id, message.id)
+        self.queue_service.set_now_playing_message(guild_id, message.id)
+        
+        # Superseded controls stop listening (timeout=None views otherwise stay registered forever)
+        # and lose their buttons, so the old message doesn't show controls that no longer respond
+        previous = self._active_views.get(guild_id)
+        self._active_views[guild_id] = view
+        if previous:
+            self._retire_view(previous)
     
     # --- Listeners ---
     
     @commands.Cog.listener()
     async def on_ready(self):
         self.logger.info(f'Music Cog ready as {self.bot.user}')
-        # Restore queues from Redis
-        for guild in self.bot.guilds:
-            self.queue_service.get_state(guild.id)  # This loads from Redis
+        # Restore queues from Redis in one pipelined round-trip
+        self.queue_service.get_states_bulk([g.id for g in self.bot.guilds])
     
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
+        # Ignore guilds we're not connected in (the vast majority of events)
+        if member.id != self.bot.user.id and member.guild.voice_client is None:
+            return
+        
         # Bot disconnected
         if member.id == self.bot.user.id and before.channel and not after.channel:
             guild_id = before.channel.guild.id
+            self.player.forget(guild_id)
+            self._np_embeds.pop(guild_id, None)
+            self._queue_embeds.pop(guild_id, None)
+            view = self._active_views.pop(guild_id, None)
+            if view:
+                self._retire_view(view)
             
             if self.player.is_intentional_disconnect(guild_id):
                 self.logger.info(f"Intentional disconnect G:{guild_id}")
@@ -114,20 +182,19 @@ class MusicCommands(commands.Cog):
         # Check if bot is alone (skip if 24/7 mode)
         if not member.bot and before.channel != after.channel:
             if before.channel:
-                bot_in_channel = any(m.id == self.bot.user.id for m in before.channel.members)
-                if bot_in_channel:
-                    non_bots = [m for m in before.channel.members if not m.bot]
-                    if not non_bots:
+                # Only the channel the bot is connected to matters; the guild's
+                # voice client is an O(1) lookup, unlike scanning the member list
+                vc = before.channel.guild.voice_client
+                if vc and vc.channel == before.channel:
+                    if not any(not m.bot for m in before.channel.members):
                         guild_id = before.channel.guild.id
                         # Check 24/7 mode
                         if self.queue_service.get_247_mode(guild_id):
                             self.logger.info(f"24/7 mode enabled, staying in {before.channel.name}")
                             return
                         
-                        vc = self.player.get_voice_client(guild_id)
-                        if vc:
-                            self.logger.info(f"Bot alone in {before.channel.name}, disconnecting...")
-                            await self.player.disconnect(guild_id)
+                        self.logger.info(f"Bot alone in {before.channel.name}, disconnecting...")
+                        await self.player.disconnect(guild_id)
     
     # --- Commands ---
     
@@ -138,30 +205,32 @@ class MusicCommands(commands.Cog):
             await ctx.send("You need to be in a voice channel!", delete_after=10)
             return
         
-        target_channel = ctx.author.voice.channel
-        vc = ctx.voice_client
-        
-        # Connect if needed
-        if not vc:
-            vc = await self.player.connect(target_channel)
-            if not vc:
-                await ctx.send("Could not connect to voice channel.", delete_after=10)
-                return
-        elif vc.channel != target_channel:
-            await vc.move_to(target_channel)
+        # Join voice while extracting; neither depends on the other
+        was_connected = ctx.voice_client is not None
+        vc_task = asyncio.create_task(self._ensure_voice(ctx, ctx.author.voice.channel))
         
         # Extract song info
-        async with ctx.typing():
-            results = await self.extractor.extract(query, ctx.author)
+        try:
+            async with ctx.typing():
+                results = await self.extractor.extract(query, ctx.author)
+        except BaseException:
+            await self._abandon_voice(ctx, vc_task, was_connected)
+            raise
         
         if isinstance(results, dict) and 'error' in results:
+            await self._abandon_voice(ctx, vc_task, was_connected)
             await ctx.send(f"Error: {results['error']}", delete_after=15)
             return
         
         if not results:
+            await self._abandon_voice(ctx, vc_task, was_connected)
             await ctx.send("No results found.", delete_after=10)
             return
         
+        if not await vc_task:
+            await ctx.send("Could not connect to voice channel.", delete_after=10)
+            return
+        
         guild_id = ctx.guild.id
         
         # Add to queue
@@ -175,24 +244,38 @@ class MusicCommands(commands.Cog):
             # Load remaining playlist in background if needed
             if count >= 20:
                 msg += " Loading more in background..."
-                asyncio.create_task(self._load_remaining_playlist(ctx, query, count))
+                self._spawn_background(self._load_remaining_playlist(ctx, query, count))
             
             await ctx.send(msg)
         
         # Start playing if not already
-        if not self.player.is_playing(guild_id) and not self.player.is_paused(guild_id):
-            success = await self.player.play_next(guild_id, self._after_play(guild_id))
+        if self.player.get_playback_state(guild_id) is PlaybackState.IDLE:
+            success = await self.player.play_next(guild_id)
             if success:
                 current = self.queue_service.get_current(guild_id)
                 if current:
-                    await self._send_now_playing(ctx, current)
+                    await self._send_now_playing(ctx, guild_id, current)
+    
+    async def _abandon_voice(self, ctx, vc_task: asyncio.Task, was_connected: bool):
+        """Settle the join started by a play request that queued nothing, leaving if it joined just for that"""
+        vc_task.cancel()
+        # gather retrieves the join's result or exception without raising it here
+        vc, = await asyncio.gather(vc_task, return_exceptions=True)
+        if not isinstance(vc, discord.VoiceClient) or was_connected:
+            return
+        guild_id = ctx.guild.id
+        if (self.player.get_playback_state(guild_id) is PlaybackState.IDLE
+                and not self.queue_service.queue_length(guild_id)):
+            await self.player.disconnect(guild_id)
     
     async def _load_remaining_playlist(self, ctx, query: str, loaded_count: int):
         """Background task to load remaining playlist songs"""
-        songs = await self.extractor.extract_remaining_playlist(query, loaded_count, ctx.author)
-        if songs:
-            self.queue_service.add_many(ctx.guild.id, songs)
-            await ctx.send(f"✅ Loaded {len(songs)} more songs from playlist.")
+        total = 0
+        async for songs in self.extractor.extract_remaining_playlist(query, loaded_count, ctx.author):
+            total += self.queue_service.add_many(ctx.guild.id, songs)
+        
+        if total:
+            await ctx.send(f"✅ Loaded {total} more songs from playlist.")
     
     @commands.cooldown(1, 2, commands.BucketType.user)
     @commands.command(name='skip', aliases=['s'], help='Skips the current song.')
@@ -200,7 +283,7 @@ class MusicCommands(commands.Cog):
         guild_id = ctx.guild.id
         vc = ctx.voice_client
         
-        if not vc or not (self.player.is_playing(guild_id) or self.player.is_paused(guild_id)):
+        if not vc or self.player.get_playback_state(guild_id) is PlaybackState.IDLE:
             await ctx.send("Nothing to skip.", delete_after=10)
             return
         
@@ -213,11 +296,11 @@ class MusicCommands(commands.Cog):
             listeners = [m for m in vc.channel.members if not m.bot]
             required = max(1, int(len(listeners) * config.VOTE_SKIP_THRESHOLD))
             
-            if not self.queue_service.add_skip_vote(guild_id, ctx.author.id):
+            added, votes = self.queue_service.add_skip_vote(guild_id, ctx.author.id)
+            if not added:
                 await ctx.send("You already voted to skip!", delete_after=5)
                 return
             
-            votes = self.queue_service.get_skip_votes(guild_id)
             if votes < required:
                 await ctx.send(f"🗳️ Vote to skip: {votes}/{required}")
                 return
@@ -268,45 +351,50 @@ class MusicCommands(commands.Cog):
     
     @commands.command(name='queue', aliases=['q'], help='Display the current song queue.')
     async def queue(self, ctx, page: int = 1):
-        guild_id = ctx.guild.id
-        queue = self.queue_service.get_queue(guild_id)
-        current = self.queue_service.get_current(guild_id)
+        snapshot = self.queue_service.get_snapshot(ctx.guild.id)
         
-        if not queue and not current:
+        if not snapshot.queue and not snapshot.current_song:
             await ctx.send("The queue is empty.", delete_after=10)
             return
         
         items_per_page = 10
-        total_pages = max(1, (len(queue) + items_per_page - 1) // items_per_page)
+        total_pages = max(1, (snapshot.queue_length + items_per_page - 1) // items_per_page)
         page = max(1, min(page, total_pages))
         
-        embed = EmbedBuilder.queue(current, queue, page, total_pages)
+        cached = self._queue_embeds.get(ctx.guild.id)
+        if cached and cached[0] == snapshot.queue_version and cached[1] == page:
+            embed = cached[2]
+        else:
+            embed = EmbedBuilder.queue(snapshot.current_song, snapshot.queue, page, total_pages)
+            self._queue_embeds[ctx.guild.id] = (snapshot.queue_version, page, embed)
         await ctx.send(embed=embed)
     
     @commands.command(name='nowplaying', aliases=['np'], help='Show the currently playing song.')
     async def nowplaying(self, ctx):
         guild_id = ctx.guild.id
-        current = self.queue_service.get_current(guild_id)
+        snapshot = self.queue_service.get_snapshot(guild_id)
         
-        if not current:
+        if not snapshot.current_song:
             await ctx.send("Nothing is currently playing.", delete_after=10)
             return
         
         elapsed = self.player.get_current_position(guild_id)
         embed = EmbedBuilder.now_playing_detailed(
-            current,
+            snapshot.current_song,
             elapsed,
-            self.queue_service.get_loop_mode(guild_id),
-            self.queue_service.get_volume(guild_id),
-            len(self.queue_service.get_queue(guild_id))
+            snapshot.loop_mode,
+            snapshot.volume,
+            snapshot.queue_length,
+            reuse=self._np_embeds.get(guild_id)
         )
+        self._np_embeds[guild_id] = embed
         await ctx.send(embed=embed)
     
     @commands.command(name='seek', help='Seek to a specific timestamp.')
     async def seek(self, ctx, timestamp: str):
         guild_id = ctx.guild.id
         
-        if not self.player.is_playing(guild_id) and not self.player.is_paused(guild_id):
+        if self.player.get_playback_state(guild_id) is PlaybackState.IDLE:
             await ctx.send("Nothing is playing.", delete_after=10)
             return
         
@@ -321,7 +409,7 @@ class MusicCommands(commands.Cog):
             return
         
         await ctx.send(f"⏩ Seeking to **{format_duration(seconds)}**...")
-        success = await self.player.seek(guild_id, seconds, self._after_play(guild_id))
+        success = await self.player.seek(guild_id, seconds)
         
         if not success:
             await ctx.send("❌ Could not seek.")
@@ -342,14 +430,14 @@ class MusicCommands(commands.Cog):
     @commands.command(name='remove', aliases=['rm'], help='Removes a song from the queue.')
     async def remove(self, ctx, index: int):
         guild_id = ctx.guild.id
-        queue = self.queue_service.get_queue(guild_id)
+        length = self.queue_service.queue_length(guild_id)
         
-        if not queue:
+        if not length:
             await ctx.send("Queue is empty.", delete_after=10)
             return
         
-        if not 1 <= index <= len(queue):
-            await ctx.send(f"Invalid index. Must be 1-{len(queue)}.", delete_after=10)
+        if not 1 <= index <= length:
+            await ctx.send(f"Invalid index. Must be 1-{length}.", delete_after=10)
             return
         
         removed = self.queue_service.remove(guild_id, index - 1)
@@ -360,34 +448,30 @@ class MusicCommands(commands.Cog):
     @commands.command(name='move', help='Move a song in the queue.')
     async def move(self, ctx, from_pos: int, to_pos: int):
         guild_id = ctx.guild.id
-        queue = self.queue_service.get_queue(guild_id)
+        length = self.queue_service.queue_length(guild_id)
         
-        if not queue:
+        if not length:
             await ctx.send("Queue is empty.", delete_after=10)
             return
         
-        if not (1 <= from_pos <= len(queue) and 1 <= to_pos <= len(queue)):
-            await ctx.send(f"Invalid positions. Queue has {len(queue)} songs.", delete_after=10)
+        if not (1 <= from_pos <= length and 1 <= to_pos <= length):
+            await ctx.send(f"Invalid positions. Queue has {length} songs.", delete_after=10)
             return
         
-        song = queue[from_pos - 1]
-        self.queue_service.move(guild_id, from_pos - 1, to_pos - 1)
-        await ctx.send(f"✅ Moved **{song.title}** from #{from_pos} to #{to_pos}")
+        song = self.queue_service.move(guild_id, from_pos - 1, to_pos - 1)
+        if song:
+            await ctx.send(f"✅ Moved **{song.title}** from #{from_pos} to #{to_pos}")
     
     @commands.command(name='filter', aliases=['effect'], help='Apply audio filter.')
     async def filter_cmd(self, ctx, filter_name: str):
-        valid_filters = ['off', 'nightcore', 'vaporwave', 'bassboost', '8d', 'karaoke']
+        name = filter_name.lower()
         
-        if filter_name.lower() not in valid_filters:
-            await ctx.send(f"❌ Invalid filter. Available: {', '.join(valid_filters)}")
+        if name not in VALID_FILTERS:
+            await ctx.send(f"❌ Invalid filter. Available: {', '.join(AUDIO_FILTERS)}")
             return
         
         await ctx.send(f"🎵 Applying **{filter_name}** filter...")
-        success = await self.player.apply_filter(
-            ctx.guild.id, 
-            filter_name.lower(),
-            self._after_play(ctx.guild.id)
-        )
+        success = await self.player.apply_filter(ctx.guild.id, name)
         
         if not success:
             await ctx.send("❌ Could not apply filter.")
@@ -423,17 +507,19 @@ class MusicCommands(commands.Cog):
             await ctx.send(f"No lyrics found for '{query}'.")
             return
         
-        # Split if too long
-        chunks = [lyrics[i:i+4096] for i in range(0, len(lyrics), 4096)]
+        # Split if too long, slicing only the pages actually sent
+        total_pages = -(-len(lyrics) // LYRICS_PAGE_SIZE)
+        sent_length = min(len(lyrics), LYRICS_MAX_PAGES * LYRICS_PAGE_SIZE)
         
-        for i, chunk in enumerate(chunks[:3], 1):
-            embed = EmbedBuilder.lyrics(query, chunk, i, len(chunks))
+        for page, start in enumerate(range(0, sent_length, LYRICS_PAGE_SIZE), 1):
+            chunk = lyrics[start:start + LYRICS_PAGE_SIZE]
+            embed = EmbedBuilder.lyrics(query, chunk, page, total_pages)
             await ctx.send(embed=embed)
     
     @commands.command(name='stats', aliases=['botinfo', 'info'], help='Show bot statistics.')
     async def stats(self, ctx):
-        uptime = format_duration(int(time.time() - self.start_time))
-        total_queued = sum(len(self.queue_service.get_queue(g.id)) for g in self.bot.guilds)
+        uptime = format_duration(int(time.monotonic() - self.start_time))
+        total_queued = self.queue_service.total_queue_length([g.id for g in self.bot.guilds])
         
         embed = EmbedBuilder.stats(
             uptime,
@@ -478,17 +564,7 @@ class MusicCommands(commands.Cog):
     @commands.group(name='playlist', aliases=['pl'], invoke_without_command=True, help='Manage saved playlists.')
     async def playlist_cmd(self, ctx):
         """Show playlist help"""
-        embed = discord.Embed(
-            title="📋 Playlist Commands",
-            description=(
-                "`-playlist save <name>` - Save current queue\n"
-                "`-playlist load <name>` - Load a saved playlist\n"
-                "`-playlist list` - Show all saved playlists\n"
-                "`-playlist delete <name>` - Delete a playlist"
-            ),
-            color=config.COLOR_INFO
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=self._playlist_help_embed)
     
     @playlist_cmd.command(name='save')
     async def playlist_save(self, ctx, *, name: str):
@@ -518,15 +594,15 @@ class MusicCommands(commands.Cog):
         await ctx.send(f"📋 Loaded **{count}** songs from playlist **{name}**!")
         
         # Start playing if not already
-        if not self.player.is_playing(guild_id) and not self.player.is_paused(guild_id):
+        if self.player.get_playback_state(guild_id) is PlaybackState.IDLE:
             if ctx.author.voice:
-                vc = ctx.voice_client or await self.player.connect(ctx.author.voice.channel)
+                vc = await self._ensure_voice(ctx, ctx.author.voice.channel)
                 if vc:
-                    success = await self.player.play_next(guild_id, self._after_play(guild_id))
+                    success = await self.player.play_next(guild_id)
                     if success:
                         current = self.queue_service.get_current(guild_id)
                         if current:
-                            await self._send_now_playing(ctx, current)
+                            await self._send_now_playing(ctx, guild_id, current)
     
     @playlist_cmd.command(name='list')
     async def playlist_list(self, ctx):
@@ -592,20 +668,14 @@ class MusicCommands(commands.Cog):
         if not request_channel_id or message.channel.id != request_channel_id:
             return
         
-        # Check for URLs
-        import re
-        url_pattern = re.compile(r'https?://[^\s]+')
-        urls = url_pattern.findall(message.content)
-        
-        if not urls:
-            return
-        
-        # Check for YouTube or Spotify URLs
-        valid_url = None
-        for url in urls:
-            if 'youtube.com' in url or 'youtu.be' in url or 'spotify.com' in url:
-                valid_url = url
-                break
+        # First YouTube or Spotify URL in the message, if any
+        valid_url = next(
+            (
+                m.group(0) for m in URL_PATTERN.finditer(message.content)
+                if any(host in m.group(0) for host in REQUEST_CHANNEL_HOSTS)
+            ),
+            None
+        )
         
         if not valid_url:
             return
@@ -645,14 +715,12 @@ class MusicCommands(commands.Cog):
             await message.add_reaction('📋')  # Playlist indicator
         
         # Start playing if not already
-        if not self.player.is_playing(guild_id) and not self.player.is_paused(guild_id):
-            # Create a fake ctx for now playing
-            ctx = await self.bot.get_context(message)
-            success = await self.player.play_next(guild_id, self._after_play(guild_id))
+        if self.player.get_playback_state(guild_id) is PlaybackState.IDLE:
+            success = await self.player.play_next(guild_id)
             if success:
                 current = self.queue_service.get_current(guild_id)
                 if current:
-                    await self._send_now_playing(ctx, current)
+                    await self._send_now_playing(message.channel, guild_id, current)
 
 
 async def setup(bot):
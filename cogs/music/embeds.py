@@ -4,11 +4,100 @@ Embed builders for music bot
 """
 
 import discord
+from functools import lru_cache
+from itertools import islice
 from typing import Optional, List
 
 import config
 from models.song import Song
-from utils.helpers import format_duration, create_progress_bar, calculate_total_queue_duration
+from utils.helpers import format_duration, create_progress_bar, UNKNOWN_DURATION_ESTIMATE
+
+
+# Static embed titles
+_NOW_PLAYING_TITLE = "🎵 Now Playing"
+_ADDED_TO_QUEUE_TITLE = "➕ Added to Queue"
+_QUEUE_TITLE = "🎵 Music Queue"
+_ERROR_TITLE = "❌ Error"
+_STATS_TITLE = "📊 Bot Statistics"
+
+# Loop mode indicators and labels
+_LOOP_EMOJI = {'off': '🚫', 'song': '🔂', 'queue': '🔁'}
+_LOOP_LABEL = {'off': 'Off', 'song': 'Song', 'queue': 'Queue'}
+
+# Field layout of the detailed now playing embed: (name, inline)
+_DETAILED_FIELDS = (
+    ("Progress", False),
+    ("Loop", True),
+    ("Volume", True),
+    ("Queue", True),
+    ("Requested by", True),
+)
+
+
+@lru_cache(maxsize=128)
+def _volume_label(volume: float) -> str:
+    return f"🔊 {int(volume * 100)}%"
+
+
+@lru_cache(maxsize=256)
+def _queue_label(queue_length: int) -> str:
+    return f"📋 {queue_length} songs"
+
+
+# Song embeds are pure functions of a few strings, and looped songs are rendered
+# again and again. The cached embeds are templates: builders hand out copies, never the cached object.
+
+@lru_cache(maxsize=512)
+def _now_playing_template(
+    title: str,
+    webpage_url: str,
+    thumbnail: Optional[str],
+    duration: str,
+    uploader: Optional[str],
+    requester: str
+) -> discord.Embed:
+    embed = discord.Embed(
+        title=_NOW_PLAYING_TITLE,
+        description=f"[{title}]({webpage_url})",
+        color=config.COLOR_SUCCESS
+    )
+    
+    if thumbnail:
+        embed.set_thumbnail(url=thumbnail)
+    
+    if duration:
+        embed.add_field(name="Duration", value=duration, inline=True)
+    
+    if uploader:
+        embed.add_field(name="Channel", value=uploader, inline=True)
+    
+    embed.add_field(name="Requested by", value=requester, inline=True)
+    
+    return embed
+
+
+@lru_cache(maxsize=512)
+def _added_to_queue_template(
+    title: str,
+    webpage_url: str,
+    thumbnail: Optional[str],
+    duration: str,
+    requester: str,
+    position: int
+) -> discord.Embed:
+    embed = discord.Embed(
+        title=_ADDED_TO_QUEUE_TITLE,
+        description=f"[{title}]({webpage_url})",
+        color=config.COLOR_QUEUED
+    )
+    embed.add_field(name="Position", value=f"#{position}", inline=True)
+    embed.add_field(name="Duration", value=duration, inline=True)
+    embed.add_field(name="Requested by", value=requester, inline=True)
+    
+    if thumbnail:
+        embed.set_thumbnail(url=thumbnail)
+    
+    return embed
 
 
 class EmbedBuilder:
@@ -16,32 +105,15 @@ class EmbedBuilder:
     
     @staticmethod
     def now_playing(song: Song) -> discord.Embed:
-        """Create now playing embed"""
-        embed = discord.Embed(
-            title="🎵 Now Playing",
-            description=f"[{song.title}]({song.webpage_url})",
-            color=config.COLOR_SUCCESS
-        )
-        
-        if song.thumbnail:
-            embed.set_thumbnail(url=song.thumbnail)
-        
-        if song.duration:
-            embed.add_field(name="Duration", value=song.formatted_duration, inline=True)
-        
-        if song.uploader:
-            embed.add_field(name="Channel", value=song.uploader, inline=True)
-        
-        # Add requester info
-        requester_val = "Unknown"
-        if song.requester:
-            requester_val = song.requester.mention
-        elif song.requester_id:
-            requester_val = f"<@{song.requester_id}>"
-        
-        embed.add_field(name="Requested by", value=requester_val, inline=True)
-        
-        return embed
+        """Create now playing embed (a copy of the cached template)"""
+        return _now_playing_template(
+            song.title,
+            song.webpage_url,
+            song.thumbnail,
+            song.formatted_duration if song.duration else "",
+            song.uploader,
+            song.requester_mention
+        ).copy()
     
     @staticmethod
     def now_playing_detailed(
@@ -49,44 +121,49 @@ class EmbedBuilder:
         elapsed: int,
         loop_mode: str,
         volume: float,
-        queue_length: int
+        queue_length: int,
+        reuse: Optional[discord.Embed] = None
     ) -> discord.Embed:
-        """Create detailed now playing embed with progress"""
-        embed = discord.Embed(
-            title="🎵 Now Playing",
-            description=f"[{song.title}]({song.webpage_url})",
-            color=config.COLOR_PLAYING
-        )
+        """Create detailed now playing embed with progress, or refresh a previous one in place"""
+        embed = reuse
+        if embed is None:
+            embed = discord.Embed(title=_NOW_PLAYING_TITLE, color=config.COLOR_PLAYING)
+            # Fixed field layout so later refreshes can use set_field_at
+            for name, inline in _DETAILED_FIELDS:
+                embed.add_field(name=name, value="\u200b", inline=inline)
+        
+        # Song-level parts only change when the song does
+        description = f"[{song.title}]({song.webpage_url})"
+        if embed.description != description:
+            embed.description = description
+            embed.set_thumbnail(url=song.thumbnail)
         
-        # Progress bar
-        progress_bar = create_progress_bar(elapsed, song.duration, length=15)
-        embed.add_field(
+        # Progress bar (live streams and unknown lengths have nothing to measure against)
+        if song.duration:
+            progress_bar = create_progress_bar(elapsed, song.duration, length=15)
+            total = song.formatted_duration
+        else:
+            progress_bar = "🔴 LIVE"
+            total = "LIVE"
+        embed.set_field_at(
+            0,
             name="Progress",
-            value=f"{progress_bar}\n`{format_duration(elapsed)} / {song.formatted_duration}`",
+            value=f"{progress_bar}\n`{format_duration(elapsed)} / {total}`",
             inline=False
         )
         
         # Loop mode
-        loop_emoji = {'off': '🚫', 'song': '🔂', 'queue': '🔁'}.get(loop_mode, '🚫')
-        embed.add_field(name="Loop", value=f"{loop_emoji} {loop_mode.capitalize()}", inline=True)
+        loop_emoji = _LOOP_EMOJI.get(loop_mode, '🚫')
+        loop_label = _LOOP_LABEL.get(loop_mode) or loop_mode.capitalize()
+        embed.set_field_at(1, name="Loop", value=f"{loop_emoji} {loop_label}", inline=True)
         
         # Volume
-        embed.add_field(name="Volume", value=f"🔊 {int(volume * 100)}%", inline=True)
+        embed.set_field_at(2, name="Volume", value=_volume_label(volume), inline=True)
         
         # Queue length
-        embed.add_field(name="Queue", value=f"📋 {queue_length} songs", inline=True)
-        
-        # Add requester info
-        requester_val = "Unknown"
-        if song.requester:
-            requester_val = song.requester.mention
-        elif song.requester_id:
-            requester_val = f"<@{song.requester_id}>"
+        embed.set_field_at(3, name="Queue", value=_queue_label(queue_length), inline=True)
         
-        embed.add_field(name="Requested by", value=requester_val, inline=True)
-        
-        if song.thumbnail:
-            embed.set_thumbnail(url=song.thumbnail)
+        embed.set_field_at(4, name="Requested by", value=song.requester_mention, inline=True)
         
         return embed
     
@@ -98,7 +175,7 @@ class EmbedBuilder:
         total_pages: int
     ) -> discord.Embed:
         """Create queue embed with pagination"""
-        embed = discord.Embed(title="🎵 Music Queue", color=config.COLOR_INFO)
+        embed = discord.Embed(title=_QUEUE_TITLE, color=config.COLOR_INFO)
         
         # Now playing
         if current:
@@ -114,19 +191,20 @@ class EmbedBuilder:
             start_idx = (page - 1) * items_per_page
             end_idx = start_idx + items_per_page
             
-            queue_text = ""
-            for i, song in enumerate(queue[start_idx:end_idx], start=start_idx + 1):
-                title = song.title[:40] + "..." if len(song.title) > 40 else song.title
-                queue_text += f"`{i}.` {title} `{song.formatted_duration}`\n"
+            # Callers clamp page to the queue, so a non-empty queue always yields lines
+            queue_text = "\n".join(
+                f"`{i}.` {song.display_title} `{song.formatted_duration}`"
+                for i, song in enumerate(islice(queue, start_idx, end_idx), start=start_idx + 1)
+            )
             
             embed.add_field(
                 name=f"Up Next ({len(queue)} songs)",
-                value=queue_text or "Empty",
+                value=queue_text,
                 inline=False
             )
             
             # Total duration
-            total_duration = calculate_total_queue_duration([s.to_dict() for s in queue])
+            total_duration = sum(s.duration or UNKNOWN_DURATION_ESTIMATE for s in queue)
             embed.set_footer(text=f"Page {page}/{total_pages} • Total: {format_duration(total_duration)}")
         else:
             embed.add_field(name="Queue", value="Empty", inline=False)
@@ -135,28 +213,15 @@ class EmbedBuilder:
     
     @staticmethod
     def added_to_queue(song: Song, position: int) -> discord.Embed:
-        """Create 'added to queue' embed"""
-        embed = discord.Embed(
-            title="➕ Added to Queue",
-            description=f"[{song.title}]({song.webpage_url})",
-            color=config.COLOR_QUEUED
-        )
-        embed.add_field(name="Position", value=f"#{position}", inline=True)
-        embed.add_field(name="Duration", value=song.formatted_duration, inline=True)
-        
-        # Add requester info
-        requester_val = "Unknown"
-        if song.requester:
-            requester_val = song.requester.mention
-        elif song.requester_id:
-            requester_val = f"<@{song.requester_id}>"
-        
-        embed.add_field(name="Requested by", value=requester_val, inline=True)
-        
-        if song.thumbnail:
-            embed.set_thumbnail(url=song.thumbnail)
-        
-        return embed
+        """Create 'added to queue' embed (a copy of the cached template)"""
+        return _added_to_queue_template(
+            song.title,
+            song.webpage_url,
+            song.thumbnail,
+            song.formatted_duration,
+            song.requester_mention,
+            position
+        ).copy()
     
     @staticmethod
     def added_playlist(count: int, more_loading: bool = False) -> discord.Embed:
@@ -188,7 +253,7 @@ class EmbedBuilder:
     def error(message: str) -> discord.Embed:
         """Create error embed"""
         return discord.Embed(
-            title="❌ Error",
+            title=_ERROR_TITLE,
             description=message,
             color=config.COLOR_ERROR
         )
@@ -202,7 +267,7 @@ class EmbedBuilder:
         cache_stats: dict
     ) -> discord.Embed:
         """Create bot stats embed"""
-        embed = discord.Embed(title="📊 Bot Statistics", color=config.COLOR_INFO)
+        embed = discord.Embed(title=_STATS_TITLE, color=config.COLOR_INFO)
         embed.add_field(name="Uptime", value=uptime, inline=True)
         embed.add_field(name="Guilds", value=str(guild_count), inline=True)
         embed.add_field(name="Voice Connections", value=str(voice_connections), inline=True)
@@ -217,3 +282,17 @@ class EmbedBuilder:
             )
         
         return embed
+    
+    @staticmethod
+    def playlist_help() -> discord.Embed:
+        """Create playlist commands help embed"""
+        return discord.Embed(
+            title="📋 Playlist Commands",
+            description=(
+                "`-playlist save <name>` - Save current queue\n"
+                "`-playlist load <name>` - Load a saved playlist\n"
+                "`-playlist list` - Show all saved playlists\n"
+                "`-playlist delete <name>` - Delete a playlist"
+            ),
+            color=config.COLOR_INFO
+        )
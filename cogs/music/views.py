@@ -3,9 +3,15 @@
 Discord UI components for music controls
 """
 
+import asyncio
 import discord
 from typing import Optional
 
+from services.player import PlaybackState
+
+
+# Seconds to wait before pushing button changes, so a burst of clicks becomes one edit
+EDIT_DEBOUNCE = 0.25
 
 class MusicControlView(discord.ui.View):
     """Interactive music control buttons"""
@@ -14,6 +20,20 @@ class MusicControlView(discord.ui.View):
         super().__init__(timeout=timeout)
         self.cog = cog
         self.message: Optional[discord.Message] = None
+        
+        # Index buttons by custom_id once instead of scanning children on every refresh
+        self._button_map = {
+            child.custom_id: child
+            for child in self.children
+            if isinstance(child, discord.ui.Button)
+        }
+        
+        # Pending coalesced message edit
+        self._edit_task: Optional[asyncio.Task] = None
+        # Button changes made since the last edit was sent
+        self._edit_dirty = False
+        # State the buttons currently show (None until first update)
+        self._last_state = None
     
     def _get_guild_id(self, interaction: discord.Interaction) -> Optional[int]:
         """Get guild ID from interaction"""
@@ -21,25 +41,60 @@ class MusicControlView(discord.ui.View):
             return interaction.guild.id
         return None
     
-    def update_buttons(self, guild_id: int):
-        """Update button states based on playback state"""
-        if not self.cog:
+    def _schedule_edit(self):
+        """Push the current button state to the message, coalescing rapid calls"""
+        if not self.message:
+            return
+        # A running flush picks this up, even if its edit is already in flight
+        self._edit_dirty = True
+        if self._edit_task and not self._edit_task.done():
+            return
+        self._edit_task = asyncio.create_task(self._flush_edit())
+    
+    async def _flush_edit(self):
+        """Wait out the debounce window, then send edits until no change is left unsent"""
+        while self._edit_dirty:
+            await asyncio.sleep(EDIT_DEBOUNCE)
+            self._edit_dirty = False
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                return  # Message was deleted or is no longer editable
+    
+    async def retire(self):
+        """Stop listening and strip the buttons from the message so none are left dead"""
+        self.stop()
+        if self._edit_task:
+            self._edit_task.cancel()
+        if not self.message:
             return
+        try:
+            await self.message.edit(view=None)
+        except discord.HTTPException:
+            pass  # Message was deleted or is no longer editable
+    
+    def update_buttons(self, guild_id: int) -> bool:
+        """Update button states based on playback state, return True if anything changed"""
+        if not self.cog:
+            return False
         
-        pause_button = discord.utils.get(self.children, custom_id="pause_resume")
-        loop_button = discord.utils.get(self.children, custom_id="loop")
+        pause_button = self._button_map.get("pause_resume")
+        loop_button = self._button_map.get("loop")
         
         if not pause_button or not loop_button:
-            return
+            return False
         
-        # Update pause/resume button
-        is_playing = self.cog.player.is_playing(guild_id)
-        is_paused = self.cog.player.is_paused(guild_id)
+        state = self.cog.player.get_state_snapshot(guild_id)
+        if state == self._last_state:
+            return False
+        self._last_state = state
+        playback, loop_mode = state
         
-        if is_paused:
+        # Update pause/resume button
+        if playback is PlaybackState.PAUSED:
             pause_button.emoji = '▶️'
             pause_button.style = discord.ButtonStyle.success
-        elif is_playing:
+        elif playback is PlaybackState.PLAYING:
             pause_button.emoji = '⏸️'
             pause_button.style = discord.ButtonStyle.secondary
         else:
@@ -47,8 +102,6 @@ class MusicControlView(discord.ui.View):
             pause_button.style = discord.ButtonStyle.secondary
         
         # Update loop button
-        loop_mode = self.cog.queue_service.get_loop_mode(guild_id)
-        
         if loop_mode == 'song':
             loop_button.emoji = '🔂'
             loop_button.style = discord.ButtonStyle.success
@@ -58,6 +111,8 @@ class MusicControlView(discord.ui.View):
         else:
             loop_button.emoji = '🚫'
             loop_button.style = discord.ButtonStyle.secondary
+        
+        return True
     
     @discord.ui.button(emoji="⏸️", style=discord.ButtonStyle.secondary, custom_id="pause_resume")
     async def pause_resume_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -66,14 +121,14 @@ class MusicControlView(discord.ui.View):
         if not guild_id:
             return
         
-        if self.cog.player.is_playing(guild_id):
+        playback = self.cog.player.get_playback_state(guild_id)
+        if playback is PlaybackState.PLAYING:
             self.cog.player.pause(guild_id)
-        elif self.cog.player.is_paused(guild_id):
+        elif playback is PlaybackState.PAUSED:
             self.cog.player.resume(guild_id)
         
-        self.update_buttons(guild_id)
-        if self.message:
-            await self.message.edit(view=self)
+        if self.update_buttons(guild_id):
+            self._schedule_edit()
     
     @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary, custom_id="skip")
     async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -98,9 +153,8 @@ class MusicControlView(discord.ui.View):
             return
         
         self.cog.queue_service.cycle_loop_mode(guild_id)
-        self.update_buttons(guild_id)
-        if self.message:
-            await self.message.edit(view=self)
+        if self.update_buttons(guild_id):
+            self._schedule_edit()
     
     @discord.ui.button(emoji="🔀", style=discord.ButtonStyle.secondary, custom_id="shuffle")
     async def shuffle_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -7,6 +7,12 @@ import logging
 import datetime
 import re
 import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+from itertools import count, islice
 import time
 import os
 
@@ -19,46 +25,187 @@ from utils.database import RedisManager
 
 # --- FFmpeg and yt-dlp Options ---
 # Use config options
-PLAYLIST_URL_PATTERN = re.compile(r'^(https?://)?(www\.)?(youtube\.com|youtu\.be)/(playlist)\?(list=.*)$')
+# One pass classifies YouTube URLs: 'pl' is set for playlist pages, 'id' holds the video/list id
+# (ASCII: YouTube ids never contain other word characters)
+URL_CLASSIFIER = re.compile(r'(?:https?://)?(?:www\.)?(?P<host>youtube\.com|youtu\.be)/(?:(?P<pl>playlist)\?list=|watch\?v=|)(?P<id>[\w-]+)?(?:[?&#].*)?', re.ASCII)
+
+# Watch-page links (what flat extraction puts in 'url'); never a playable stream
+_YT_WEBPAGE = re.compile(r'https?://(?:www\.)?youtube\.com/')
+
+# Resolved stream URLs: googlevideo links carry their expiry time ("expire=<epoch>");
+# others are assumed good for a few hours. Refresh a little before the deadline.
+STREAM_EXPIRE_PATTERN = re.compile(r'[?&/]expire[=/](\d+)')
+STREAM_URL_DEFAULT_TTL = 5 * 3600
+STREAM_URL_EXPIRY_MARGIN = 60
+STREAM_CACHE_MAX = 512
+
+# Now-playing edits are merged and flushed at most once per this many seconds (per-message edit bucket is 5/5s)
+NP_EDIT_DEBOUNCE = 1.0
+
+# Now-playing sends wait this long (seconds) so a burst of skips only posts the last song
+NP_COALESCE_DELAY = 0.5
+
+# Queues longer than this are shuffled on a worker thread so the event loop keeps heartbeating
+SHUFFLE_OFFLOAD_THRESHOLD = 1000
+
+
+def stream_url_expiry(url):
+    match = STREAM_EXPIRE_PATTERN.search(url)
+    if match:
+        return int(match.group(1))
+    return time.time() + STREAM_URL_DEFAULT_TTL
+
+
+def queue_line(position, song):
+    """One 'Up Next' row of the queue listing"""
+    get = song.get
+    return f"`{position}.` {(get('title') or 'Unknown')[:40]} `{format_duration(get('duration'))}`"
+
+
+# Loop mode lookup tables (unknown modes are treated as 'off')
+_LOOP_NEXT = {'off': 'song', 'song': 'queue', 'queue': 'off'}
+_LOOP_MODE_TEXT = {'song': 'Song Loop 🔂', 'queue': 'Queue Loop 🔁', 'off': 'Loop Off 🚫'}
+_LOOP_FIELD = {'off': '🚫 Off', 'song': '🔂 Song', 'queue': '🔁 Queue'}
+_LOOP_BUTTON = {
+    'song': ('🔂', discord.ButtonStyle.success),
+    'queue': ('🔁', discord.ButtonStyle.success),
+    'off': ('🚫', discord.ButtonStyle.secondary),
+}
+
+
+def build_np_embed(song, elapsed, loop_mode, volume, queue_len):
+    """Detailed now-playing embed, assembled as one dict and converted in a single from_dict call"""
+    get = song.get
+    duration = get('duration', 0)
+    data = {
+        'title': "🎵 Now Playing",
+        'description': f"[{get('title', 'Unknown')}]({get('webpage_url', '')})",
+        'color': config.COLOR_PLAYING,
+        'fields': [
+            {'name': "Progress", 'value': f"{create_progress_bar(elapsed, duration or 0, length=15)}\n`{format_duration(elapsed)} / {format_duration(duration)}`", 'inline': False},
+            {'name': "Loop", 'value': _LOOP_FIELD.get(loop_mode, _LOOP_FIELD['off']), 'inline': True},
+            {'name': "Volume", 'value': f"🔊 {int(volume * 100)}%", 'inline': True},
+            {'name': "Queue", 'value': f"📋 {queue_len} songs", 'inline': True},
+        ],
+    }
+    thumbnail = get('thumbnail')
+    if thumbnail:
+        data['thumbnail'] = {'url': thumbnail}
+    return discord.Embed.from_dict(data)
+
+
+def build_queue_embed(queue, current, page, total_pages, items_per_page):
+    """One page of the queue listing, assembled the same way as build_np_embed"""
+    fields = []
+    if current:
+        fields.append({
+            'name': "Now Playing",
+            'value': f"[{current.get('title', 'Unknown')}]({current.get('webpage_url', '')})\n`{format_duration(current.get('duration'))}`",
+            'inline': False,
+        })
+    data = {'title': "🎵 Music Queue", 'color': config.COLOR_INFO, 'fields': fields}
+    if queue:
+        start_idx = (page - 1) * items_per_page
+        queue_text = "\n".join(map(queue_line, count(start_idx + 1), islice(queue, start_idx, start_idx + items_per_page)))
+        fields.append({'name': f"Up Next ({len(queue)} songs)", 'value': queue_text or "Empty", 'inline': False})
+        total_duration = calculate_total_queue_duration(queue)
+        data['footer'] = {'text': f"Page {page}/{total_pages} • Total: {format_duration(total_duration)}"}
+    return discord.Embed.from_dict(data)
+
+
+# Fields filled in by resolve_stream_url at play time
+RESOLVED_FIELDS = ('url', 'duration', 'thumbnail', 'uploader')
+
+
+def build_playlist_stubs(entries, requester_id=None):
+    """Stubs for a flat playlist's entries, plus how many were skipped; plain Python, safe to run off-loop"""
+    entries = list(entries)
+    # Unavailable videos come back as None (ignoreerrors) or without an id; skip them in the same pass
+    stubs = [playlist_stub(e, requester_id) for e in entries if e and e.get('id')]
+    return stubs, len(entries) - len(stubs)
+
+
+def playlist_stub(entry, requester_id=None):
+    """Lightweight queue entry for a flat playlist item; metadata is resolved at play time"""
+    url = entry.get('url') or ''
+    webpage_url = entry.get('webpage_url') or (url if _YT_WEBPAGE.match(url) else None)
+    if not webpage_url and entry.get('id'):
+        webpage_url = f"https://www.youtube.com/watch?v={entry['id']}"
+    return {
+        'id': entry.get('id'),
+        'title': entry.get('title'),
+        'webpage_url': webpage_url,
+        'requester_id': requester_id,
+        'resolved': False,
+    }
+
+# --- Per-guild State ---
+@dataclass(slots=True)
+class GuildMusicState:
+    """Everything the cog tracks for one guild, reached with a single dict lookup"""
+    queue: deque = field(default_factory=deque) # song_info dicts
+    current: Optional[dict] = None # song_info of the playing song
+    loop_mode: Optional[str] = None # 'off', 'song', 'queue'; None until read from Redis
+    np_message: Optional[discord.Message] = None
+    np_view: Optional['MusicControlView'] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock) # serializes queue mutations
+    queue_version: int = 0 # bumped whenever queue or current changes
+    queue_embed: Optional[tuple] = None # (queue_version, page, Embed) of the last queue listing
 
 # --- Music Control View (Updated with Shuffle Button) ---
 class MusicControlView(discord.ui.View):
+    # View itself isn't slotted, so instances keep a __dict__; these get fixed slots for the hot reads
+    __slots__ = ('cog', 'message', 'ctx_ref', 'interaction', '_target_guild', '_btn_pr', '_btn_loop', '_btn_shuffle', '_last_state')
+
     def __init__(self, cog_ref, timeout=None):
         super().__init__(timeout=timeout)
         self.cog = cog_ref
         self.message = None
         self.ctx_ref = None
         self.interaction = None
+        self._target_guild = None # Resolved once; a view never changes guild
+        # Buttons are static, so index them once (one pass over children) instead of scanning per update
+        buttons = {child.custom_id: child for child in self.children if isinstance(child, discord.ui.Button)}
+        self._btn_pr = buttons.get('pause_resume')
+        self._btn_loop = buttons.get('loop')
+        self._btn_shuffle = buttons.get('shuffle')
+        self._last_state = None # (is_playing, is_paused, loop_mode) the buttons currently show
+
+    def _get_guild(self):
+        if self._target_guild is None:
+            if self.interaction and self.interaction.guild: self._target_guild = self.interaction.guild
+            elif self.message and self.message.guild: self._target_guild = self.message.guild
+            elif self.ctx_ref and self.ctx_ref.guild: self._target_guild = self.ctx_ref.guild
+        return self._target_guild
 
     def _get_vc(self):
-        if self.cog and self.cog.bot.guilds:
-             target_guild = None
-             if self.interaction and self.interaction.guild: target_guild = self.interaction.guild
-             elif self.message and self.message.guild: target_guild = self.message.guild
-             elif self.ctx_ref and self.ctx_ref.guild: target_guild = self.ctx_ref.guild 
-             if target_guild: return discord.utils.get(self.cog.bot.voice_clients, guild=target_guild)
+        if self.cog:
+             target_guild = self._get_guild()
+             if target_guild: return target_guild.voice_client
         return None
 
-    def update_buttons(self, interaction: discord.Interaction = None):
+    def update_buttons(self, interaction: discord.Interaction = None) -> bool:
+        """Sync button looks with playback state; returns False when nothing visible changed"""
         if interaction: self.interaction = interaction
-        target_guild: discord.Guild = None
-        if self.interaction and self.interaction.guild: target_guild = self.interaction.guild
-        elif self.message and self.message.guild: target_guild = self.message.guild
-        elif self.ctx_ref and self.ctx_ref.guild: target_guild = self.ctx_ref.guild
-        if not target_guild: self.cog.logger.warning("update_buttons no guild context."); return
+        target_guild: discord.Guild = self._get_guild()
+        if not target_guild: self.cog.logger.warning("update_buttons no guild context."); return False
         guild_id = target_guild.id
-        vc = discord.utils.get(self.cog.bot.voice_clients, guild=target_guild)
+        vc = target_guild.voice_client
 
         # Load loop mode from Redis if not in memory
-        loop_mode = self.cog.loop_mode.get(guild_id)
+        state = self.cog._state(guild_id)
+        loop_mode = state.loop_mode
         if loop_mode is None:
-            loop_mode = self.cog.db.get_loop_mode(guild_id)
-            self.cog.loop_mode[guild_id] = loop_mode
+            loop_mode = state.loop_mode = self.cog.db.get_loop_mode(guild_id)
 
-        pause_resume_button = discord.utils.get(self.children, custom_id="pause_resume")
-        loop_button = discord.utils.get(self.children, custom_id="loop")
+        pause_resume_button = self._btn_pr
+        loop_button = self._btn_loop
         
-        is_paused = vc and vc.is_paused(); is_playing = vc and vc.is_playing()
+        is_playing, is_paused = (vc.is_playing(), vc.is_paused()) if vc else (False, False)
+
+        button_state = (is_playing, is_paused, loop_mode)
+        if button_state == self._last_state: return False
+        self._last_state = button_state
 
         if is_paused:
             pause_resume_button.emoji = '▶️'; pause_resume_button.style = discord.ButtonStyle.success
@@ -67,12 +214,8 @@ class MusicControlView(discord.ui.View):
         else:
             pause_resume_button.emoji = '▶️'; pause_resume_button.style = discord.ButtonStyle.secondary
 
-        if loop_mode == 'song':
-            loop_button.emoji = '🔂'; loop_button.style = discord.ButtonStyle.success
-        elif loop_mode == 'queue':
-            loop_button.emoji = '🔁'; loop_button.style = discord.ButtonStyle.success
-        else: # Off
-            loop_button.emoji = '🚫'; loop_button.style = discord.ButtonStyle.secondary
+        loop_button.emoji, loop_button.style = _LOOP_BUTTON.get(loop_mode, _LOOP_BUTTON['off'])
+        return True
 
 
 
@@ -81,10 +224,10 @@ class MusicControlView(discord.ui.View):
         await interaction.response.defer()
         vc = self._get_vc()
         if not vc: return
-        if vc.is_playing(): vc.pause()
-        elif vc.is_paused(): vc.resume()
-        self.update_buttons(interaction)
-        if self.message: await self.message.edit(view=self)
+        is_playing, is_paused = vc.is_playing(), vc.is_paused()
+        if is_playing: vc.pause()
+        elif is_paused: vc.resume()
+        if self.update_buttons(interaction) and self.message: self.cog._schedule_np_edit(interaction.guild.id, view=self)
 
     @discord.ui.button(label="", emoji="⏭️", style=discord.ButtonStyle.secondary, custom_id="skip")
     async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -97,59 +240,92 @@ class MusicControlView(discord.ui.View):
         await interaction.response.defer()
         vc = self._get_vc()
         if vc: 
-            guild_id = vc.guild.id
-            if guild_id in self.cog.queues: self.cog.queues[guild_id] = []
-            self.cog.db.clear_queue(guild_id) # Clear from Redis
-            if guild_id in self.cog.current_song: del self.cog.current_song[guild_id]
-            await self.cog.delete_now_playing_message(guild_id)
-            vc.stop()
+            await self.cog.reset_playback(vc.guild.id, vc)
 
     @discord.ui.button(label="", emoji="🔁", style=discord.ButtonStyle.secondary, custom_id="loop")
     async def loop_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer()
         if not self.cog: return
         guild_id = interaction.guild.id
+        state = self.cog._state(guild_id)
         
-        current = self.cog.loop_mode.get(guild_id)
+        current = state.loop_mode
         if current is None:
             current = self.cog.db.get_loop_mode(guild_id)
             
-        new_mode = 'song' if current == 'off' else 'queue' if current == 'song' else 'off'
-        self.cog.loop_mode[guild_id] = new_mode
+        new_mode = _LOOP_NEXT.get(current, 'off')
+        state.loop_mode = new_mode
         self.cog.db.set_loop_mode(guild_id, new_mode) # Persist to Redis
-        self.update_buttons(interaction)
-        if self.message: await self.message.edit(view=self)
+        if self.update_buttons(interaction) and self.message: self.cog._schedule_np_edit(guild_id, view=self)
 
     @discord.ui.button(label="", emoji="🔀", style=discord.ButtonStyle.secondary, custom_id="shuffle")
     async def shuffle_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer()
         if not self.cog: return
         guild_id = interaction.guild.id
-        if guild_id in self.cog.queues and len(self.cog.queues[guild_id]) > 1:
-            random.shuffle(self.cog.queues[guild_id])
-            self.cog.db.save_queue(guild_id, self.cog.queues[guild_id]) # Save shuffled queue
+        state = self.cog._state(guild_id)
+        async with state.lock:
+            if len(state.queue) > 1:
+                await self.cog.shuffle_queue(guild_id)
+                self.cog.save_queue(guild_id) # Save shuffled queue
             
 # --- Main Cog ---
 class MusicCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('music_bot')
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.cache = GuildCache()
         self.lyrics_provider = LyricsProvider()
         self.db = RedisManager(host=os.getenv('REDIS_HOST', 'redis'))
         
-        self.queues = {}  # guild_id: list of song_info dicts
-        self.loop_mode = {}  # guild_id: 'off', 'song', 'queue'
+        self.states = {}  # guild_id: GuildMusicState
         self.volume = {}  # guild_id: float (0.0 - 1.0)
-        self.current_song = {}  # guild_id: song_info dict
-        self.now_playing_messages = {} # guild_id: (message, view)
         self.vote_skip_voters = {}  # guild_id: set of user_ids
         self.is_disconnecting = set() # guild_id
         self.seeking_guilds = set() # guild_id
-        self.song_start_times = {} # guild_id: timestamp
+        self.song_start_times = {} # guild_id: time.monotonic() at song start
         self.audio_filters = {} # guild_id: filter_name
 
+        self._stream_cache = {} # webpage_url: (resolved song_info, expires_at epoch)
+        self._prefetch = {} # guild_id: (webpage_url, asyncio.Task) resolving the next song
+        self._warmups = {} # guild_id: {webpage_url: asyncio.Task} warming the stream cache further ahead
+        self._np_pending = {} # guild_id: asyncio.Task waiting to post the now-playing message
+        self._np_edit_tasks = {} # guild_id: asyncio.Task flushing merged now-playing edits
+        self._np_edit_pending = {} # guild_id: merged message.edit kwargs awaiting flush
+        self._side_tasks = set() # in-flight fire-and-forget REST calls (reactions, notices)
+        self._song_end_tasks = set() # in-flight _on_song_end tasks (player thread callbacks, skipped songs)
+        self._rest_sem = asyncio.Semaphore(config.MAX_CONCURRENT_REST) # bounds bursts of message edits/deletes across guilds
+
+        # Long-lived extractors so HTTP connections, cookies and extractor caches are reused instead of
+        # rebuilt on every query. YoutubeDL isn't thread-safe, so each pool thread builds its own pair.
+        self._ydl_local = threading.local()
+        self._ydl_instances = [] # every per-thread YoutubeDL, for cog_unload
+        self._ydl_instances_lock = threading.Lock()
+        # Dedicated bounded pool so extractions neither flood DNS nor starve the default executor
+        self._ydl_pool = ThreadPoolExecutor(max_workers=config.YDL_WORKERS, thread_name_prefix='ytdl', initializer=self._init_ydl_thread)
+
+    def _init_ydl_thread(self):
+        """Pool initializer: this thread's flat (playlist) and full extractors"""
+        local = self._ydl_local
+        local.flat = yt_dlp.YoutubeDL({**config.YDL_BASE_OPTIONS, 'extract_flat': 'in_playlist', 'noplaylist': False})
+        local.full = yt_dlp.YoutubeDL({**config.YDL_BASE_OPTIONS, 'extract_flat': False, 'noplaylist': True})
+        with self._ydl_instances_lock: self._ydl_instances += (local.flat, local.full)
+
+    def _extract(self, flat, query):
+        """Runs on a pool thread, with that thread's own extractor"""
+        ydl = self._ydl_local.flat if flat else self._ydl_local.full
+        return ydl.extract_info(query, download=False)
+
+    def cog_unload(self):
+        for guild_id in list(self._prefetch.keys() | self._warmups.keys()): self.cancel_prefetch(guild_id)
+        for task in self._np_pending.values(): task.cancel()
+        for task in self._np_edit_tasks.values(): task.cancel()
+        self._ydl_pool.shutdown(wait=False, cancel_futures=True)
+        with self._ydl_instances_lock:
+            for ydl in self._ydl_instances: ydl.close()
+            self._ydl_instances.clear()
+
     @commands.Cog.listener()
     async def on_ready(self):
         self.logger.info(f'Music Cog ready as {self.bot.user}')
@@ -157,7 +333,10 @@ class MusicCog(commands.Cog):
         for guild in self.bot.guilds:
             queue = self.db.load_queue(guild.id)
             if queue:
-                self.queues[guild.id] = queue
+                state = self._state(guild.id)
+                async with state.lock:
+                    state.queue.extend(queue)
+                    state.queue_version += 1
                 self.logger.info(f"Restored queue for guild {guild.name} ({len(queue)} songs)")
 
     @commands.Cog.listener()
@@ -172,65 +351,148 @@ class MusicCog(commands.Cog):
                 return
 
             self.logger.info(f"Bot disconnected VC G:{guild_id}")
-            if guild_id in self.queues: self.queues[guild_id].clear()
-            self.db.clear_queue(guild_id) # Clear Redis queue
-            if guild_id in self.current_song: del self.current_song[guild_id]
-            if guild_id in self.loop_mode: del self.loop_mode[guild_id]
-            await self.delete_now_playing_message(guild_id)
+            self._state(guild_id).loop_mode = None
+            await self.reset_playback(guild_id)
             return
 
         if not member.bot and before.channel != after.channel:
-            if before.channel:
-                # Check if bot is alone
-                bot_in_channel = any(m.id == self.bot.user.id for m in before.channel.members)
-                if bot_in_channel:
-                    non_bots = [m for m in before.channel.members if not m.bot]
-                    if not non_bots:
-                        vc = discord.utils.get(self.bot.voice_clients, guild=before.channel.guild)
-                        if vc:
-                            self.logger.info(f"Bot alone in {before.channel.name}, disconnecting...")
-                            await vc.disconnect()
+            # Only a leave from the bot's own channel can leave it alone; disconnect right away
+            vc = member.guild.voice_client
+            if vc and before.channel == vc.channel and not any(not m.bot for m in vc.channel.members):
+                self.logger.info(f"Bot alone in {vc.channel.name}, disconnecting...")
+                await vc.disconnect()
+
+    def _state(self, guild_id) -> GuildMusicState:
+        state = self.states.get(guild_id)
+        if state is None:
+            state = self.states[guild_id] = GuildMusicState()
+        return state
+
+    def save_queue(self, guild_id):
+        state = self._state(guild_id)
+        state.queue_version += 1
+        self.db.save_queue(guild_id, list(state.queue))
+
+    async def shuffle_queue(self, guild_id):
+        """Shuffle the guild's queue; callers hold state.lock across the await"""
+        # Sample a permutation from a list copy (deque middle access is O(n)) and build the new deque in one pass
+        state = self._state(guild_id)
+        songs = list(state.queue)
+        # A head that is already resolving in the background stays put, so that work isn't thrown away
+        # (with only two songs that would make shuffle a no-op, so those reshuffle fully)
+        head = songs[:1] if guild_id in self._prefetch and len(songs) > 2 else []
+        rest = songs[len(head):]
+        if len(rest) > SHUFFLE_OFFLOAD_THRESHOLD:
+            rest = await asyncio.to_thread(random.sample, rest, len(rest))
+        else:
+            rest = random.sample(rest, len(rest))
+        state.queue = deque(head + rest)
+        if not head: self.cancel_prefetch(guild_id)
+
+    def prefetch_next(self, guild_id):
+        """Start resolving the next PREFETCH_DEPTH queue entries while the current song plays"""
+        entry = self._prefetch.pop(guild_id, None)
+        if entry: entry[1].cancel()
+        warmups = self._warmups.setdefault(guild_id, {})
+        for position, song_info in enumerate(islice(self._state(guild_id).queue, config.PREFETCH_DEPTH)):
+            webpage_url = song_info.get('webpage_url') or song_info.get('original_url')
+            if not webpage_url or song_info.get('url'): continue
+            if position == 0:
+                # The head may already be warming from an earlier song; adopt that task instead of starting another
+                task = warmups.pop(webpage_url, None) or self.bot.loop.create_task(self.resolve_stream_url(song_info))
+                self._prefetch[guild_id] = (webpage_url, task)
+            elif webpage_url not in warmups and webpage_url not in self._stream_cache:
+                # Only fills the stream cache; when the song comes up, resolve_stream_url is a cache hit
+                task = warmups[webpage_url] = self.bot.loop.create_task(self.resolve_stream_url(song_info))
+                task.add_done_callback(lambda t, url=webpage_url: warmups.get(url) is t and warmups.pop(url))
+
+    def cancel_prefetch(self, guild_id):
+        entry = self._prefetch.pop(guild_id, None)
+        if entry: entry[1].cancel()
+        for task in self._warmups.pop(guild_id, {}).values(): task.cancel()
+
+    def _schedule_np_edit(self, guild_id, **fields):
+        """Merge fields into the pending now-playing edit; one worker per guild flushes them"""
+        self._np_edit_pending.setdefault(guild_id, {}).update(fields)
+        if guild_id not in self._np_edit_tasks:
+            self._np_edit_tasks[guild_id] = self.bot.loop.create_task(self._np_edit_worker(guild_id))
+
+    async def _np_edit_worker(self, guild_id):
+        try:
+            await asyncio.sleep(NP_EDIT_DEBOUNCE)
+        finally:
+            self._np_edit_tasks.pop(guild_id, None)
+        payload = self._np_edit_pending.pop(guild_id, None)
+        state = self.states.get(guild_id)
+        if not payload or not state or not state.np_message: return
+        try:
+            async with self._rest_sem: await state.np_message.edit(**payload)
+        except discord.HTTPException as e: self.logger.warning(f"Now playing edit failed G:{guild_id}: {e}")
 
     async def delete_now_playing_message(self, guild_id):
-        if guild_id in self.now_playing_messages:
-            message_id = self.now_playing_messages[guild_id]
-            del self.now_playing_messages[guild_id]
+        pending = self._np_pending.pop(guild_id, None)
+        if pending: pending.cancel()
+        edit_task = self._np_edit_tasks.pop(guild_id, None)
+        if edit_task: edit_task.cancel()
+        self._np_edit_pending.pop(guild_id, None)
+        state = self.states.get(guild_id)
+        if state and state.np_message:
+            message, view = state.np_message, state.np_view
+            state.np_message = state.np_view = None
+            view.stop()
+            try:
+                async with self._rest_sem: await message.delete()
+            except discord.HTTPException: pass
+
+    async def reset_playback(self, guild_id, vc=None):
+        """Drop queue, current song and now-playing message as one transition under the guild lock"""
+        state = self._state(guild_id)
+        async with state.lock:
+            state.queue.clear()
+            state.current = None
+            state.queue_version += 1
+            self.cancel_prefetch(guild_id)
+            self.db.clear_queue(guild_id) # Clear Redis
+        # Silence the player before any REST round-trip; its after-callback finds an empty queue
+        if vc: vc.stop()
+        # Message delete is a REST call, so it runs after the lock is released
+        await self.delete_now_playing_message(guild_id)
 
     async def _load_remaining_playlist(self, ctx, query, initial_count):
         """Background task to load the rest of a large playlist"""
         try:
             ydl_opts = config.YDL_BASE_OPTIONS.copy()
-            ydl_opts['extract_flat'] = True
+            ydl_opts['extract_flat'] = 'in_playlist'
             ydl_opts['playliststart'] = initial_count + 1
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, query, download=False)
+                info = await self.bot.loop.run_in_executor(self._ydl_pool, ydl.extract_info, query, False)
                 
                 if 'entries' in info:
-                    new_songs = list(info['entries'])
+                    new_songs = await self._playlist_stubs(info['entries'], ctx.author.id)
                     if not new_songs: return
                     
-                    if ctx.guild.id not in self.queues:
-                        self.queues[ctx.guild.id] = []
-                        
-                    self.queues[ctx.guild.id].extend(new_songs)
-                    self.db.save_queue(ctx.guild.id, self.queues[ctx.guild.id])
+                    state = self._state(ctx.guild.id)
+                    async with state.lock:
+                        state.queue.extend(new_songs)
+                        self.save_queue(ctx.guild.id)
                     
                     await ctx.send(f"✅ Loaded {len(new_songs)} more songs from playlist.")
                     
         except Exception as e:
             self.logger.error(f"Error loading remaining playlist: {e}")
 
-    async def search_and_get_info(self, query):
-        ydl_opts = config.YDL_BASE_OPTIONS.copy()
-        is_playlist = bool(PLAYLIST_URL_PATTERN.match(query))
-        
-        if is_playlist:
-            ydl_opts['extract_flat'] = True
-            ydl_opts['noplaylist'] = False
-        else:
-            ydl_opts['extract_flat'] = False
-            ydl_opts['noplaylist'] = True
+    async def _playlist_stubs(self, entries, requester_id=None):
+        # Hundreds of entries: build the stubs on the extraction pool rather than the event loop
+        stubs, skipped = await self.bot.loop.run_in_executor(self._ydl_pool, build_playlist_stubs, entries, requester_id)
+        if skipped:
+            self.logger.warning(f"Skipped {skipped} unavailable playlist entries")
+        return stubs
+
+    async def search_and_get_info(self, query, requester_id=None):
+        # Plain searches never mention the host, so they skip the regex entirely
+        url_match = URL_CLASSIFIER.fullmatch(query) if 'youtu' in query else None
+        is_playlist = bool(url_match and url_match.group('pl'))
 
         try:
             # Check for Spotify URL
@@ -238,31 +500,62 @@ class MusicCog(commands.Cog):
                 # Placeholder for Spotify handling
                 pass
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, query, download=False)
-                
-                if 'entries' in info:
-                    return info['entries']
-                else:
-                    return [info]
+            info = await self.bot.loop.run_in_executor(self._ydl_pool, self._extract, is_playlist, query)
+            
+            if 'entries' in info:
+                if is_playlist:
+                    # Requester is written into each stub as it is built, not in a second pass
+                    return await self._playlist_stubs(info['entries'], requester_id)
+                songs = [e for e in info['entries'] if e]
+            else:
+                songs = [info]
+            for song in songs: song['requester_id'] = requester_id
+            return songs
         except Exception as e:
             self.logger.error(f"YTDL error: {e}")
             
             # Smart Search Fallback
-            if "http" in query: # If it looked like a URL
+            if url_match or "http" in query: # If it looked like a URL
                 self.logger.info(f"URL failed, trying smart search for: {query}")
                 try:
                     search_query = f"ytsearch:{query}"
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        info = await asyncio.to_thread(ydl.extract_info, search_query, download=False)
-                        if 'entries' in info and info['entries']:
-                            return [info['entries'][0]]
+                    info = await self.bot.loop.run_in_executor(self._ydl_pool, self._extract, is_playlist, search_query)
+                    if 'entries' in info and info['entries']:
+                        song = info['entries'][0]
+                        song['requester_id'] = requester_id
+                        return [song]
                 except Exception as inner_e:
                     self.logger.error(f"Smart search failed: {inner_e}")
             
             return {'error': str(e)}
 
-    def play_next(self, ctx):
+    async def resolve_stream_url(self, song_info):
+        """Return the stream URL and playback metadata for song_info, from cache when still valid"""
+        webpage_url = song_info.get('webpage_url') or song_info.get('original_url')
+        if not webpage_url:
+            return None
+
+        cached = self._stream_cache.get(webpage_url)
+        if cached and cached[1] - STREAM_URL_EXPIRY_MARGIN > time.time():
+            return cached[0]
+
+        self.logger.info(f"Re-extracting stream URL for: {song_info.get('title')}")
+        refreshed = await self.search_and_get_info(webpage_url)
+        if not refreshed or isinstance(refreshed, dict):
+            return None
+        resolved = refreshed[0]
+        stream_url = resolved.get('url')
+        if not stream_url:
+            return None
+
+        fields = {key: resolved.get(key) for key in RESOLVED_FIELDS}
+        if len(self._stream_cache) >= STREAM_CACHE_MAX:
+            # Oldest insertion first
+            self._stream_cache.pop(next(iter(self._stream_cache)))
+        self._stream_cache[webpage_url] = (fields, stream_url_expiry(stream_url))
+        return fields
+
+    async def play_next_async(self, ctx):
         guild_id = ctx.guild.id
         vc = ctx.voice_client
         
@@ -270,31 +563,33 @@ class MusicCog(commands.Cog):
         
         if guild_id in self.seeking_guilds:
             self.seeking_guilds.remove(guild_id)
-            # Don't pop from queue if seeking, just replay current
-            if guild_id in self.current_song:
-                pass # Logic handled in seek
+            # Don't pop from queue if seeking, just replay current (logic handled in seek)
         else:
-            if guild_id in self.queues and self.queues[guild_id]:
-                # Loop logic
-                loop_mode = self.loop_mode.get(guild_id, 'off')
-                if loop_mode == 'song':
-                    if guild_id in self.current_song:
-                        self.queues[guild_id].insert(0, self.current_song[guild_id])
-                elif loop_mode == 'queue':
-                    if guild_id in self.current_song:
-                        self.queues[guild_id].append(self.current_song[guild_id])
-                
-                # Get next song
-                song_info = self.queues[guild_id].pop(0)
-                self.current_song[guild_id] = song_info
-                self.db.save_queue(guild_id, self.queues[guild_id]) # Update Redis
-                
-                # Schedule async play
-                asyncio.run_coroutine_threadsafe(self._play_song(ctx, song_info), self.bot.loop)
+            song_info = None
+            state = self._state(guild_id)
+            async with state.lock:
+                if state.queue:
+                    # Loop logic
+                    loop_mode = state.loop_mode or 'off'
+                    if loop_mode == 'song':
+                        if state.current:
+                            state.queue.appendleft(state.current)
+                    elif loop_mode == 'queue':
+                        if state.current:
+                            state.queue.append(state.current)
+                    
+                    # Get next song
+                    song_info = state.current = state.queue.popleft()
+                    self.save_queue(guild_id) # Update Redis
+                else:
+                    # Queue empty
+                    state.current = None
+                    state.queue_version += 1
+            
+            if song_info:
+                await self._play_song(ctx, song_info)
             else:
-                # Queue empty
-                if guild_id in self.current_song: del self.current_song[guild_id]
-                asyncio.run_coroutine_threadsafe(self.delete_now_playing_message(guild_id), self.bot.loop)
+                await self.delete_now_playing_message(guild_id)
 
     async def _play_song(self, ctx, song_info):
         """Async helper to play a song with URL refresh if needed"""
@@ -306,20 +601,36 @@ class MusicCog(commands.Cog):
         
         try:
             url = song_info.get('url')
-            # Re-extract if URL expired or missing (common with extract_flat)
+            # Entries queued before stubs may carry the watch page here rather than a stream
+            if url and _YT_WEBPAGE.match(url):
+                url = None
+            # Looped songs keep their old stream URL; treat it as missing once it expires
+            if url and stream_url_expiry(url) - STREAM_URL_EXPIRY_MARGIN <= time.time():
+                url = None
+            # Re-extract if URL expired or missing (playlist stubs carry no stream URL)
             if not url:
-                webpage_url = song_info.get('webpage_url') or song_info.get('original_url')
-                if webpage_url:
-                    self.logger.info(f"Re-extracting stream URL for: {song_info.get('title')}")
-                    refreshed = await self.search_and_get_info(webpage_url)
-                    if refreshed and not isinstance(refreshed, dict) and refreshed:
-                        song_info = refreshed[0]
-                        self.current_song[guild_id] = song_info
-                        url = song_info.get('url')
+                resolved = None
+                prefetched = self._prefetch.pop(guild_id, None)
+                if prefetched and prefetched[0] == (song_info.get('webpage_url') or song_info.get('original_url')):
+                    # Already resolving (or resolved) in the background; don't start a second extraction
+                    try: resolved = await prefetched[1]
+                    except asyncio.CancelledError: resolved = None
+                elif prefetched:
+                    prefetched[1].cancel()
+                if not resolved:
+                    resolved = await self.resolve_stream_url(song_info)
+                if resolved:
+                    song_info = {**song_info, **resolved, 'resolved': True}
+                    state = self._state(guild_id)
+                    state.current = song_info
+                    state.queue_version += 1 # resolved duration shows in the listing
+                    url = song_info.get('url')
             
             if not url:
                 self.logger.error(f"Could not get stream URL for: {song_info.get('title')}")
-                self.play_next(ctx)
+                # The notice goes out alongside the next song's start rather than ahead of it
+                self._fire(ctx.send(f"❌ Couldn't load **{song_info.get('title') or 'Unknown Title'}**, skipping.", delete_after=15))
+                self._start_song_end(ctx, None)
                 return
                 
             volume = self.volume.get(guild_id)
@@ -336,25 +647,101 @@ class MusicCog(commands.Cog):
             source = discord.FFmpegOpusAudio(url, **ffmpeg_opts)
             vc.play(source, after=lambda e: self.after_play_handler(e, ctx))
             
-            self.song_start_times[guild_id] = time.time()
+            self.song_start_times[guild_id] = time.monotonic()
+            self.prefetch_next(guild_id)
             await self.send_now_playing(ctx, song_info)
             
         except Exception as e:
             self.logger.error(f"Error playing song: {e}")
-            self.play_next(ctx)
+            self._start_song_end(ctx, None)
 
     def after_play_handler(self, error, ctx):
+        # Runs on the FFmpeg player thread: one plain callback hop, no cross-thread Future to complete
+        self.bot.loop.call_soon_threadsafe(self._start_song_end, ctx, error)
+
+    def _start_song_end(self, ctx, error):
+        """Advance to the next song in a tracked task (player thread callback, skipped or failed songs)"""
+        task = asyncio.create_task(self._on_song_end(ctx, error))
+        # Keep a strong reference until the task finishes
+        self._song_end_tasks.add(task)
+        task.add_done_callback(self._song_end_done)
+
+    def _song_end_done(self, task):
+        self._song_end_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            self.logger.error(f"Advancing to the next song failed: {task.exception()}")
+
+    async def _on_song_end(self, ctx, error):
         if error:
             self.logger.error(f"Player error: {error}")
-        self.play_next(ctx)
+        await self.play_next_async(ctx)
 
     async def send_now_playing(self, ctx, song_info):
+        # Replace any send still waiting out its window; only the newest song gets posted
         guild_id = ctx.guild.id
+        pending = self._np_pending.pop(guild_id, None)
+        if pending: pending.cancel()
+        self._np_pending[guild_id] = self.bot.loop.create_task(self._send_now_playing_later(ctx, song_info))
+
+    async def _send_now_playing_later(self, ctx, song_info):
+        guild_id = ctx.guild.id
+        await asyncio.sleep(NP_COALESCE_DELAY)
+        # Past the window: leave the pending slot so a newer song can't cancel us mid-send
+        if self._np_pending.get(guild_id) is asyncio.current_task():
+            del self._np_pending[guild_id]
         embed = discord.Embed(title="Now Playing", description=f"[{song_info.get('title')}]({song_info.get('webpage_url')})", color=config.COLOR_SUCCESS)
         view = MusicControlView(self)
-        view.update_buttons() # Set initial button states
-        message = await ctx.send(embed=embed, view=view)
-        self.now_playing_messages[guild_id] = message.id # Store ID
+        view.ctx_ref = ctx
+        try:
+            view.update_buttons() # Set initial button states
+            message = await ctx.send(embed=embed, view=view)
+        except discord.HTTPException as e:
+            view.stop(); self.logger.warning(f"Now playing send failed G:{guild_id}: {e}"); return
+        except Exception as e:
+            view.stop(); self.logger.error(f"Now playing send error G:{guild_id}: {e}"); return
+        view.message = message
+        state = self._state(guild_id)
+        old_message, old_view = state.np_message, state.np_view
+        self._np_edit_pending.pop(guild_id, None) # Queued edits were for the old message
+        state.np_message, state.np_view = message, view
+        # Old controls stop listening once superseded, and lose their buttons so none are left dead
+        if old_view: old_view.stop()
+        if old_message: self._fire(self._strip_controls(old_message))
+
+    async def _strip_controls(self, message):
+        try:
+            async with self._rest_sem: await message.edit(view=None)
+        except discord.HTTPException: pass # Already deleted or no longer editable
+
+    def _is_admin(self, member):
+        # guild_permissions folds the member's cached roles locally; no request, nothing worth caching
+        perms = member.guild_permissions
+        return perms.manage_channels or perms.move_members
+
+    async def _fail(self, ctx, msg, reaction='❓'):
+        """Send a short-lived error and react in parallel; a failed reaction doesn't sink the send"""
+        await asyncio.gather(ctx.send(msg, delete_after=10), ctx.message.add_reaction(reaction), return_exceptions=True)
+
+    def _fire(self, coro):
+        """Run a REST call in the background; nothing waits on it, so the caller moves on right away"""
+        task = asyncio.create_task(coro)
+        # Keep a strong reference until the task finishes
+        self._side_tasks.add(task)
+        task.add_done_callback(self._side_task_done)
+
+    def _side_task_done(self, task):
+        self._side_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            self.logger.debug(f"Background send failed: {task.exception()}")
+
+    def _react(self, ctx, emoji):
+        self._fire(ctx.message.add_reaction(emoji))
+
+    async def _ok(self, ctx, msg=None, reaction='✅'):
+        if msg is None:
+            self._react(ctx, reaction)
+            return
+        await asyncio.gather(ctx.send(msg), ctx.message.add_reaction(reaction), return_exceptions=True)
 
     @commands.cooldown(1, 3, commands.BucketType.user)
     @commands.command(name='play', aliases=['p'], help='Plays a song from YouTube.')
@@ -378,7 +765,7 @@ class MusicCog(commands.Cog):
         elif vc.channel != target_channel:
             await vc.move_to(target_channel)
 
-        results = await self.search_and_get_info(query)
+        results = await self.search_and_get_info(query, ctx.author.id)
         
         if isinstance(results, dict) and 'error' in results:
             await ctx.send(f"Error: {results['error']}")
@@ -388,21 +775,17 @@ class MusicCog(commands.Cog):
             await ctx.send("No results found.")
             return
 
-        if ctx.guild.id not in self.queues:
-            self.queues[ctx.guild.id] = []
-
-        added = 0
-        
         # Handle large playlists
         is_large_playlist = len(results) > 20
         initial_load = results[:20] if is_large_playlist else results
         
-        for song in initial_load:
-            self.queues[ctx.guild.id].append(song)
-            added += 1
+        state = self._state(ctx.guild.id)
+        async with state.lock:
+            state.queue.extend(initial_load)
+            added = len(initial_load)
             
-        # Save queue to Redis
-        self.db.save_queue(ctx.guild.id, self.queues[ctx.guild.id])
+            # Save queue to Redis
+            self.save_queue(ctx.guild.id)
             
         if added == 1:
             await ctx.send(f"Added **{initial_load[0].get('title')}** to queue.")
@@ -414,24 +797,24 @@ class MusicCog(commands.Cog):
                 asyncio.create_task(self._load_remaining_playlist(ctx, query, 20))
             await ctx.send(msg)
 
-        if not vc.is_playing() and not vc.is_paused():
-            self.play_next(ctx)
+        is_playing_or_paused = vc.is_playing() or vc.is_paused()
+        if not is_playing_or_paused:
+            await self.play_next_async(ctx)
 
     @commands.cooldown(1, 2, commands.BucketType.user)
     @commands.command(name='skip', aliases=['s'], help='Skips the current song.')
     async def skip(self, ctx):
         vc = ctx.voice_client
         if not vc or not (vc.is_playing() or vc.is_paused()):
-            await ctx.send("Nothing to skip.", delete_after=10)
-            await ctx.message.add_reaction('❓')
+            await self._fail(ctx, "Nothing to skip.")
             return
 
         guild_id = ctx.guild.id
-        current_song = self.current_song.get(guild_id)
-        requester = current_song.get('requester') if current_song else None
+        current_song = self._state(guild_id).current
+        requester_id = current_song.get('requester_id') if current_song else None
         
-        is_admin = ctx.author.guild_permissions.manage_channels or ctx.author.guild_permissions.move_members
-        is_requester = requester and ctx.author.id == requester.id
+        is_admin = self._is_admin(ctx.author)
+        is_requester = requester_id is not None and ctx.author.id == requester_id
         
         if not is_admin and not is_requester:
             listeners = [member for member in vc.channel.members if not member.bot]
@@ -441,15 +824,16 @@ class MusicCog(commands.Cog):
                 required_votes = int(listener_count * config.VOTE_SKIP_THRESHOLD)
                 if required_votes < 1: required_votes = 1
                 
-                if guild_id not in self.vote_skip_voters:
-                    self.vote_skip_voters[guild_id] = set()
+                voters = self.vote_skip_voters.get(guild_id)
+                if voters is None:
+                    voters = self.vote_skip_voters[guild_id] = set()
                 
-                if ctx.author.id in self.vote_skip_voters[guild_id]:
+                if ctx.author.id in voters:
                     await ctx.send("You have already voted to skip!", delete_after=5)
                     return
                 
-                self.vote_skip_voters[guild_id].add(ctx.author.id)
-                current_votes = len(self.vote_skip_voters[guild_id])
+                voters.add(ctx.author.id)
+                current_votes = len(voters)
                 
                 if current_votes < required_votes:
                     await ctx.send(f"🗳️ Vote to skip: {current_votes}/{required_votes}")
@@ -457,18 +841,15 @@ class MusicCog(commands.Cog):
                 else:
                     await ctx.send("🗳️ Vote threshold met! Skipping...")
         
-        await ctx.message.add_reaction('⏭️')
-        if guild_id in self.vote_skip_voters:
-            self.vote_skip_voters[guild_id].clear()
+        self._react(ctx, '⏭️')
+        self.vote_skip_voters.pop(guild_id, None)
         vc.stop()
 
     @commands.command(name='stop', help='Stops playback and clears queue.')
     async def stop(self, ctx):
         vc = ctx.voice_client
         if vc:
-            self.queues[ctx.guild.id] = []
-            self.db.clear_queue(ctx.guild.id) # Clear Redis
-            vc.stop()
+            await self.reset_playback(ctx.guild.id, vc)
             await ctx.send("Stopped and cleared queue. ⏹️")
 
     @commands.command(name='volume', aliases=['vol'], help='Sets the volume (0-100).')
@@ -492,15 +873,21 @@ class MusicCog(commands.Cog):
     @commands.command(name='loop', help='Cycles loop mode.')
     async def loop(self, ctx):
         guild_id = ctx.guild.id
-        current = self.loop_mode.get(guild_id)
+        state = self._state(guild_id)
+        current = state.loop_mode
         if current is None:
              current = self.db.get_loop_mode(guild_id)
              
-        new_mode = 'song' if current == 'off' else 'queue' if current == 'song' else 'off'
-        self.loop_mode[guild_id] = new_mode
+        new_mode = _LOOP_NEXT.get(current, 'off')
+        state.loop_mode = new_mode
         self.db.set_loop_mode(guild_id, new_mode) # Persist
         
-        await ctx.send(f"Loop mode: **{new_mode}**")
+        # Refresh the live now-playing controls in place
+        view = state.np_view
+        if view and view.update_buttons():
+            self._schedule_np_edit(guild_id, view=view)
+        
+        await ctx.send(f"Loop mode: **{_LOOP_MODE_TEXT[new_mode]}**")
 
     @commands.command(name='seek', help='Seek to a specific timestamp (e.g., 1:30, 90s).')
     async def seek(self, ctx, timestamp: str):
@@ -516,7 +903,7 @@ class MusicCog(commands.Cog):
             await ctx.send("❌ Invalid timestamp format. Use MM:SS or seconds (e.g., 1:30, 90).")
             return
             
-        current_song = self.current_song.get(guild_id)
+        current_song = self._state(guild_id).current
         if not current_song:
             await ctx.send("Error: No song info found.")
             return
@@ -546,12 +933,13 @@ class MusicCog(commands.Cog):
                 self.audio_filters[guild_id] = audio_filter
 
             ffmpeg_opts = config.get_ffmpeg_options(volume=volume, filter_name=audio_filter)
+            # The shared options are read-only; seeking gets its own copy
             base_before_options = ffmpeg_opts.get('before_options', '')
-            ffmpeg_opts['before_options'] = f"-ss {seconds} {base_before_options}"
+            ffmpeg_opts = {**ffmpeg_opts, 'before_options': f"-ss {seconds} {base_before_options}"}
             
             new_source = discord.FFmpegOpusAudio(stream_url, **ffmpeg_opts)
             
-            self.song_start_times[guild_id] = time.time() - seconds
+            self.song_start_times[guild_id] = time.monotonic() - seconds
             self.seeking_guilds.add(guild_id)
             
             vc.stop()
@@ -560,8 +948,7 @@ class MusicCog(commands.Cog):
         except Exception as e:
             self.logger.error(f"Seek error: {e}")
             await ctx.send(f"❌ Error seeking: {e}")
-            if guild_id in self.seeking_guilds:
-                self.seeking_guilds.discard(guild_id)
+            self.seeking_guilds.discard(guild_id)
 
     @commands.command(name='filter', aliases=['effect'], help='Apply audio filter (nightcore, vaporwave, bassboost, 8d, off).')
     async def filter(self, ctx, filter_name: str):
@@ -580,40 +967,52 @@ class MusicCog(commands.Cog):
         # Restart current song to apply filter
         vc = ctx.voice_client
         if vc and (vc.is_playing() or vc.is_paused()):
-            current_pos = time.time() - self.song_start_times.get(guild_id, time.time())
+            now = time.monotonic()
+            current_pos = now - self.song_start_times.get(guild_id, now)
             timestamp = format_duration(int(current_pos))
             await self.seek(ctx, timestamp)
 
     @commands.command(name='remove', aliases=['rm'], help='Removes a song from the queue by its index.')
     async def remove(self, ctx, index: int):
         guild_id = ctx.guild.id
-        if guild_id not in self.queues or not self.queues[guild_id]:
-            await ctx.send("The queue is empty.", delete_after=10); await ctx.message.add_reaction('❓'); return
-        queue_len = len(self.queues[guild_id])
+        state = self._state(guild_id)
+        async with state.lock:
+            # Read the deque under the lock: a shuffle swaps in a new one
+            queue = state.queue
+            queue_len = len(queue)
+            if queue_len and 1 <= index <= queue_len:
+                # Ends are O(1) on a deque; a middle delete rotates from whichever end is closer
+                if index == 1: removed_song = queue.popleft()
+                elif index == queue_len: removed_song = queue.pop()
+                else:
+                    removed_song = queue[index - 1]
+                    del queue[index - 1]
+                self.save_queue(guild_id) # Update Redis
+        if not queue_len:
+            await self._fail(ctx, "The queue is empty."); return
         if not 1 <= index <= queue_len:
-            await ctx.send(f"Invalid index. Must be between 1 and {queue_len}.", delete_after=10); await ctx.message.add_reaction('❌'); return
-        removed_song = self.queues[guild_id].pop(index - 1)
-        self.db.save_queue(guild_id, self.queues[guild_id]) # Update Redis
-        await ctx.send(f"🗑️ Removed **{removed_song.get('title','Unknown Title')}** (position {index}).")
-        await ctx.message.add_reaction('✅')
+            await self._fail(ctx, f"Invalid index. Must be between 1 and {queue_len}.", '❌'); return
+        await self._ok(ctx, f"🗑️ Removed **{removed_song.get('title','Unknown Title')}** (position {index}).")
 
     @commands.command(name='shuffle', help='Shuffles the current song queue.')
     async def shuffle(self, ctx):
         guild_id = ctx.guild.id
-        if guild_id not in self.queues or len(self.queues[guild_id]) < 2:
-            await ctx.send("Not enough songs in the queue to shuffle.", delete_after=10); await ctx.message.add_reaction('❓'); return
-        random.shuffle(self.queues[guild_id])
-        self.db.save_queue(guild_id, self.queues[guild_id]) # Update Redis
-        await ctx.send("🔀 Queue shuffled!")
-        await ctx.message.add_reaction('✅')
+        state = self._state(guild_id)
+        if len(state.queue) < 2:
+            await self._fail(ctx, "Not enough songs in the queue to shuffle."); return
+        async with state.lock:
+            await self.shuffle_queue(guild_id)
+            self.save_queue(guild_id) # Update Redis
+        await self._ok(ctx, "🔀 Queue shuffled!")
 
     @commands.command(name='pause', help='Pauses the currently playing song.')
     async def pause(self, ctx):
         vc = ctx.voice_client
-        if vc and vc.is_playing():
+        is_playing, is_paused = (vc.is_playing(), vc.is_paused()) if vc else (False, False)
+        if is_playing:
             vc.pause()
-            await ctx.message.add_reaction('⏸️')
-        elif vc and vc.is_paused():
+            self._react(ctx, '⏸️')
+        elif is_paused:
              await ctx.send("Already paused.")
         else:
             await ctx.send("Nothing playing.")
@@ -621,10 +1020,11 @@ class MusicCog(commands.Cog):
     @commands.command(name='resume', help='Resumes the currently paused song.')
     async def resume(self, ctx):
         vc = ctx.voice_client
-        if vc and vc.is_paused():
+        is_playing, is_paused = (vc.is_playing(), vc.is_paused()) if vc else (False, False)
+        if is_paused:
             vc.resume()
-            await ctx.message.add_reaction('▶️')
-        elif vc and vc.is_playing():
+            self._react(ctx, '▶️')
+        elif is_playing:
             await ctx.send("Already playing.")
         else:
             await ctx.send("Nothing paused.")
@@ -634,9 +1034,9 @@ class MusicCog(commands.Cog):
     async def lyrics(self, ctx, *, query: str = None):
         if not query:
             # Try to get current song
-            guild_id = ctx.guild.id
-            if guild_id in self.current_song:
-                query = self.current_song[guild_id].get('title')
+            current = self._state(ctx.guild.id).current
+            if current:
+                query = current.get('title')
         
         if not query:
             await ctx.send("Please provide a song name or play something first.")
@@ -662,9 +1062,9 @@ class MusicCog(commands.Cog):
 
     @commands.command(name='stats', aliases=['botinfo', 'info'], help='Show bot statistics.')
     async def stats(self, ctx):
-        uptime_seconds = int(time.time() - self.start_time)
+        uptime_seconds = int(time.monotonic() - self.start_time)
         uptime_str = format_duration(uptime_seconds)
-        total_queued = sum(len(q) for q in self.queues.values())
+        total_queued = sum(len(state.queue) for state in self.states.values())
         cache_stats = self.cache.get_all_stats()
         
         embed = discord.Embed(title="📊 Bot Statistics", color=config.COLOR_INFO)
@@ -684,26 +1084,31 @@ class MusicCog(commands.Cog):
     @commands.command(name='move', help='Move a song in the queue (e.g., -move 3 1).')
     async def move(self, ctx, from_pos: int, to_pos: int):
         guild_id = ctx.guild.id
-        queue = self.queues.get(guild_id, [])
+        state = self._state(guild_id)
         
-        if not queue:
-            await ctx.send("Queue is empty.", delete_after=10); return
+        async with state.lock:
+            # Read the deque under the lock: a shuffle swaps in a new one
+            queue = state.queue
+            queue_len = len(queue)
+            valid = 1 <= from_pos <= queue_len and 1 <= to_pos <= queue_len
+            if valid:
+                song = queue[from_pos - 1]
+                del queue[from_pos - 1]
+                queue.insert(to_pos - 1, song)
+                self.save_queue(guild_id) # Update Redis
         
-        if not (1 <= from_pos <= len(queue)) or not (1 <= to_pos <= len(queue)):
-            await ctx.send(f"Invalid positions. Queue has {len(queue)} songs.", delete_after=10); return
+        if not queue_len:
+            await ctx.send("Queue is empty.", delete_after=10); return
         
-        song = queue.pop(from_pos - 1)
-        queue.insert(to_pos - 1, song)
-        self.db.save_queue(guild_id, queue) # Update Redis
+        if not valid:
+            await ctx.send(f"Invalid positions. Queue has {queue_len} songs.", delete_after=10); return
         
-        await ctx.send(f"✅ Moved **{song['title']}** from position {from_pos} to {to_pos}")
-        await ctx.message.add_reaction('✅')
+        await self._ok(ctx, f"✅ Moved **{song['title']}** from position {from_pos} to {to_pos}")
 
     @commands.command(name='queue', aliases=['q'], help='Display the current song queue.')
     async def queue(self, ctx, page: int = 1):
-        guild_id = ctx.guild.id
-        queue = self.queues.get(guild_id, [])
-        current = self.current_song.get(guild_id)
+        state = self._state(ctx.guild.id)
+        queue, current = state.queue, state.current
         
         if not queue and not current:
             await ctx.send("The queue is empty.", delete_after=10)
@@ -714,40 +1119,21 @@ class MusicCog(commands.Cog):
         total_pages = max(1, (len(queue) + items_per_page - 1) // items_per_page)
         page = max(1, min(page, total_pages))
         
-        start_idx = (page - 1) * items_per_page
-        end_idx = start_idx + items_per_page
-        
-        embed = discord.Embed(title="🎵 Music Queue", color=config.COLOR_INFO)
-        
-        # Now playing
-        if current:
-            duration = format_duration(current.get('duration'))
-            embed.add_field(
-                name="Now Playing",
-                value=f"[{current.get('title', 'Unknown')}]({current.get('webpage_url', '')})\n`{duration}`",
-                inline=False
-            )
-        
-        # Queue items
-        if queue:
-            queue_text = ""
-            for i, song in enumerate(queue[start_idx:end_idx], start=start_idx + 1):
-                title = song.get('title', 'Unknown')[:40]
-                duration = format_duration(song.get('duration'))
-                queue_text += f"`{i}.` {title} `{duration}`\n"
-            
-            embed.add_field(name=f"Up Next ({len(queue)} songs)", value=queue_text or "Empty", inline=False)
-            
-            # Total duration
-            total_duration = calculate_total_queue_duration(queue)
-            embed.set_footer(text=f"Page {page}/{total_pages} • Total: {format_duration(total_duration)}")
+        # Same queue, same page: the listing can't have changed
+        cached = state.queue_embed
+        if cached and cached[0] == state.queue_version and cached[1] == page:
+            await ctx.send(embed=cached[2])
+            return
         
+        embed = build_queue_embed(queue, current, page, total_pages, items_per_page)
+        state.queue_embed = (state.queue_version, page, embed)
         await ctx.send(embed=embed)
 
     @commands.command(name='nowplaying', aliases=['np'], help='Show the currently playing song.')
     async def nowplaying(self, ctx):
         guild_id = ctx.guild.id
-        current = self.current_song.get(guild_id)
+        state = self._state(guild_id)
+        current = state.current
         vc = ctx.voice_client
         
         if not current or not vc:
@@ -755,40 +1141,10 @@ class MusicCog(commands.Cog):
             return
         
         # Calculate progress
-        start_time = self.song_start_times.get(guild_id, time.time())
-        elapsed = int(time.time() - start_time)
-        duration = current.get('duration', 0)
-        
-        progress_bar = create_progress_bar(elapsed, duration, length=15)
-        
-        embed = discord.Embed(
-            title="🎵 Now Playing",
-            description=f"[{current.get('title', 'Unknown')}]({current.get('webpage_url', '')})",
-            color=config.COLOR_PLAYING
-        )
-        
-        embed.add_field(
-            name="Progress",
-            value=f"{progress_bar}\n`{format_duration(elapsed)} / {format_duration(duration)}`",
-            inline=False
-        )
-        
-        # Loop mode
-        loop_mode = self.loop_mode.get(guild_id, 'off')
-        loop_emoji = {'off': '🚫', 'song': '🔂', 'queue': '🔁'}.get(loop_mode, '🚫')
-        embed.add_field(name="Loop", value=f"{loop_emoji} {loop_mode.capitalize()}", inline=True)
-        
-        # Volume
-        volume = self.volume.get(guild_id, 1.0)
-        embed.add_field(name="Volume", value=f"🔊 {int(volume * 100)}%", inline=True)
-        
-        # Queue length
-        queue_len = len(self.queues.get(guild_id, []))
-        embed.add_field(name="Queue", value=f"📋 {queue_len} songs", inline=True)
-        
-        if current.get('thumbnail'):
-            embed.set_thumbnail(url=current.get('thumbnail'))
+        now = time.monotonic()
+        elapsed = int(now - self.song_start_times.get(guild_id, now))
         
+        embed = build_np_embed(current, elapsed, state.loop_mode or 'off', self.volume.get(guild_id, 1.0), len(state.queue))
         await ctx.send(embed=embed)
 
     @commands.command(name='disconnect', aliases=['leave', 'dc'], help='Disconnect the bot from voice channel.')
@@ -804,19 +1160,16 @@ class MusicCog(commands.Cog):
         self.is_disconnecting.add(guild_id)
         
         # Clear queue
-        if guild_id in self.queues:
-            self.queues[guild_id] = []
-        self.db.clear_queue(guild_id)
-        
-        if guild_id in self.current_song:
-            del self.current_song[guild_id]
-        
-        await self.delete_now_playing_message(guild_id)
+        await self.reset_playback(guild_id)
         await vc.disconnect()
         await ctx.send("👋 Disconnected from voice channel.")
 
 async def setup(bot):
     ydl_logger = logging.getLogger('yt_dlp')
-    if not ydl_logger.hasHandlers(): ydl_logger.setLevel(logging.WARNING)
+    if not ydl_logger.hasHandlers():
+        # Terminate the logger here: records stop at the level check instead of walking up to root's handlers
+        ydl_logger.setLevel(logging.WARNING)
+        ydl_logger.addHandler(logging.NullHandler())
+        ydl_logger.propagate = False
     await bot.add_cog(MusicCog(bot))
     print("Music Cog Loaded")
\ No newline at end of file
@@ -5,6 +5,8 @@ All configurable settings are centralized here
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -34,9 +36,19 @@ METADATA_CACHE_TTL = int(os.getenv("METADATA_CACHE_TTL", "3600"))  # 1 hour
 # Cache TTL for stream URLs (seconds)
 STREAM_URL_CACHE_TTL = int(os.getenv("STREAM_URL_CACHE_TTL", "300"))  # 5 minutes
 
+# Cache TTL for per-guild settings read on hot paths (seconds)
+SETTINGS_CACHE_TTL = int(os.getenv("SETTINGS_CACHE_TTL", "30"))
+
 # Maximum cache size (number of items)
 MAX_CACHE_SIZE = int(os.getenv("MAX_CACHE_SIZE", "500"))
 
+# ====== Redis Configuration ======
+# Connections shared by all Redis users in the process
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "32"))
+
+# Name reported by CLIENT LIST for this bot's connections
+REDIS_CLIENT_NAME = os.getenv("REDIS_CLIENT_NAME", "music-bot")
+
 # ====== History Configuration ======
 # Maximum history size per guild
 MAX_HISTORY_SIZE = int(os.getenv("MAX_HISTORY_SIZE", "50"))
@@ -48,6 +60,18 @@ RATE_LIMIT_COMMANDS = int(os.getenv("RATE_LIMIT_COMMANDS", "5"))
 # Rate limit window (seconds)
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
 
+# Maximum background playlist loads running at once (bot-wide)
+MAX_BACKGROUND_LOADS = int(os.getenv("MAX_BACKGROUND_LOADS", "4"))
+
+# Threads reserved for yt-dlp extraction (caps concurrent extractions)
+YDL_WORKERS = int(os.getenv("YDL_WORKERS", "4"))
+
+# Upcoming songs whose stream URLs are resolved ahead of playback (1 = just the next song)
+PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", "3"))
+
+# Maximum now-playing message edits/deletes in flight at once (bot-wide)
+MAX_CONCURRENT_REST = int(os.getenv("MAX_CONCURRENT_REST", "20"))
+
 # ====== Permissions ======
 # DJ role name (leave empty to disable DJ role requirement)
 DJ_ROLE_NAME = os.getenv("DJ_ROLE_NAME", "")
@@ -92,23 +116,28 @@ YDL_BASE_OPTIONS = {
 }
 
 # ====== FFmpeg Configuration ======
+@lru_cache(maxsize=64)
 def get_ffmpeg_options(volume: float = 1.0, filter_name: str = 'off'):
     """
     Generate FFmpeg options with dynamic audio filters
     
+    Results are memoized per (volume, filter_name) and returned read-only;
+    build a new dict to change an option (e.g. {**opts, 'before_options': ...}).
+    
     Args:
         volume: Volume level (0.0-1.0)
         filter_name: Name of the filter ('off', 'nightcore', 'vaporwave', 'bassboost', '8d')
                      Supports chaining via '+' (e.g. 'nightcore+bassboost')
     
     Returns:
-        dict: FFmpeg options
+        Mapping: FFmpeg options
     """
     # Logarithmic volume scaling (cubic) for more natural feel
     # vol_cmd = volume^3. 0.5 input -> 0.125 output (much quieter than 0.5 linear)
     # This gives more precision at lower volumes.
+    # Full volume needs no filter; leaving the graph empty lets ffmpeg skip libavfilter entirely
     vol_cmd = max(volume, 0.0) ** 3
-    filters = [f"volume={vol_cmd:.4f}"]
+    filters = [f"volume={vol_cmd:.4f}"] if vol_cmd != 1.0 else []
     
     # Pre-defined filters
     # Note: asetrate changes both speed and pitch. aresample restores sample rate for Discord.
@@ -128,12 +157,14 @@ def get_ffmpeg_options(volume: float = 1.0, filter_name: str = 'off'):
         if f_name in filter_map:
             filters.extend(filter_map[f_name])
     
-    filter_string = ','.join(filters)
+    options = '-vn'
+    if filters:
+        options += f' -filter:a "{",".join(filters)}"'
     
-    return {
-        'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
-        'options': f'-vn -filter:a "{filter_string}"'
-    }
+    return MappingProxyType({
+        'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -nostdin',
+        'options': options
+    })
 
 # Default FFmpeg options
 FFMPEG_OPTIONS = get_ffmpeg_options()
@@ -4,6 +4,6 @@ Models package for Discord Music Bot
 """
 
 from .song import Song
-from .guild_state import GuildState
+from .guild_state import GuildState, QueueSnapshot
 
-__all__ = ['Song', 'GuildState']
+__all__ = ['Song', 'GuildState', 'QueueSnapshot']
@@ -3,8 +3,10 @@
 Guild state data model
 """
 
+import random
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional, Literal, List
+from typing import Deque, Optional, Literal
 from .song import Song
 
 
@@ -17,13 +19,13 @@ class GuildState:
     """Per-guild music state"""
     
     guild_id: int
-    queue: List[Song] = field(default_factory=list)
+    queue: Deque[Song] = field(default_factory=deque)  # popleft() per song is O(1)
     current_song: Optional[Song] = None
     loop_mode: LoopMode = 'off'
     volume: float = 1.0  # 0.0 - 1.0
     audio_filter: FilterName = 'off'
     is_paused: bool = False
-    song_start_time: Optional[float] = None  # timestamp when song started
+    song_start_time: Optional[float] = None  # time.monotonic() when song started
     
     # Feature flags
     is_247_mode: bool = False  # Stay connected even when alone
@@ -31,6 +33,7 @@ class GuildState:
     
     # UI state
     now_playing_message_id: Optional[int] = None
+    queue_version: int = 0  # changes whenever queue or current song changes (see QueueService)
     
     # Vote skip tracking
     vote_skip_users: set = field(default_factory=set)
@@ -43,7 +46,9 @@ class GuildState:
     def remove_from_queue(self, index: int) -> Optional[Song]:
         """Remove song at index (0-based), return removed song"""
         if 0 <= index < len(self.queue):
-            return self.queue.pop(index)
+            song = self.queue[index]
+            del self.queue[index]
+            return song
         return None
     
     def get_next_song(self) -> Optional[Song]:
@@ -60,7 +65,7 @@ class GuildState:
             self.queue.append(self.current_song)
         
         if self.queue:
-            return self.queue.pop(0)
+            return self.queue.popleft()
         
         return None
     
@@ -71,16 +76,19 @@ class GuildState:
     
     def shuffle_queue(self):
         """Shuffle the queue"""
-        import random
-        random.shuffle(self.queue)
+        # Shuffle a list copy: random.shuffle indexes every slot, which is O(n) per access on a deque
+        songs = list(self.queue)
+        random.shuffle(songs)
+        self.queue = deque(songs)
     
-    def move_song(self, from_pos: int, to_pos: int) -> bool:
-        """Move song from one position to another (0-based)"""
+    def move_song(self, from_pos: int, to_pos: int) -> Optional[Song]:
+        """Move song from one position to another (0-based), return moved song"""
         if not (0 <= from_pos < len(self.queue) and 0 <= to_pos < len(self.queue)):
-            return False
-        song = self.queue.pop(from_pos)
+            return None
+        song = self.queue[from_pos]
+        del self.queue[from_pos]
         self.queue.insert(to_pos, song)
-        return True
+        return song
     
     def reset_vote_skip(self):
         """Reset vote skip tracking"""
@@ -95,3 +103,15 @@ class GuildState:
     def queue_length(self) -> int:
         """Number of songs in queue"""
         return len(self.queue)
+
+
+@dataclass(frozen=True)
+class QueueSnapshot:
+    """Read-only view of the fields display commands need, taken in one lookup"""
+    
+    current_song: Optional[Song]
+    queue: Deque[Song]
+    loop_mode: LoopMode
+    volume: float
+    queue_length: int
+    queue_version: int
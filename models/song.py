@@ -4,6 +4,7 @@ Song data model
 """
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Optional, Any
 import discord
 
@@ -41,6 +42,26 @@ class Song:
             view_count=info.get('view_count'),
         )
     
+    @classmethod
+    def from_flat_entry(cls, entry: dict, requester: Optional[discord.Member] = None) -> 'Song':
+        """Create a Song from a flat playlist entry; its stream URL is resolved at play time"""
+        # Flat entries carry the watch page in 'url', which is not a playable stream
+        page_url = entry.get('webpage_url') or entry.get('url') or ''
+        if not page_url and entry.get('id'):
+            page_url = f"https://www.youtube.com/watch?v={entry['id']}"
+        return cls(
+            title=entry.get('title') or 'Unknown Title',
+            url='',
+            webpage_url=page_url,
+            duration=int(entry.get('duration') or 0),
+            thumbnail=entry.get('thumbnail'),
+            requester=requester,
+            requester_id=requester.id if requester else None,
+            original_url=page_url,
+            uploader=entry.get('uploader'),
+            view_count=entry.get('view_count'),
+        )
+    
     def to_dict(self) -> dict:
         """Convert to dictionary for Redis storage"""
         return {
@@ -70,6 +91,22 @@ class Song:
             requester_id=data.get('requester_id'),
         )
     
+    @cached_property
+    def display_title(self) -> str:
+        """Title truncated for list displays (computed once per song)"""
+        if len(self.title) > 40:
+            return self.title[:40] + "..."
+        return self.title
+    
+    @cached_property
+    def requester_mention(self) -> str:
+        """Mention for whoever requested the song (computed once per song)"""
+        if self.requester:
+            return self.requester.mention
+        if self.requester_id:
+            return f"<@{self.requester_id}>"
+        return "Unknown"
+    
     @property
     def is_url_valid(self) -> bool:
         """Check if stream URL is present"""
@@ -78,9 +115,9 @@ class Song:
     def __str__(self) -> str:
         return f"{self.title} ({self.formatted_duration})"
     
-    @property
+    @cached_property
     def formatted_duration(self) -> str:
-        """Return duration as MM:SS or HH:MM:SS"""
+        """Return duration as MM:SS or HH:MM:SS (computed once per song)"""
         if self.duration <= 0:
             return "N/A"
         hours, remainder = divmod(self.duration, 3600)
@@ -5,6 +5,6 @@ Services package for Discord Music Bot
 
 from .extractor import ExtractorService
 from .queue import QueueService
-from .player import PlayerService
+from .player import PlayerService, PlaybackState, PlayerStateSnapshot
 
-__all__ = ['ExtractorService', 'QueueService', 'PlayerService']
+__all__ = ['ExtractorService', 'QueueService', 'PlayerService', 'PlaybackState', 'PlayerStateSnapshot']
@@ -4,9 +4,12 @@ Audio extractor service - wraps yt-dlp functionality
 """
 
 import asyncio
+import functools
 import logging
 import re
-from typing import List, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional, Union
 from urllib.parse import urlparse, parse_qs
 
 import aiohttp
@@ -33,21 +36,55 @@ class ExtractorService:
     
     def __init__(self):
         self.logger = logger
+        # Dedicated extraction threads: yt-dlp calls don't queue behind (or starve) the loop's default executor
+        self._executor = ThreadPoolExecutor(max_workers=config.YDL_WORKERS, thread_name_prefix='ydl')
+        # Long-lived YoutubeDL instances, one per (worker thread, option overrides):
+        # YoutubeDL keeps per-run playlist bookkeeping, so an instance is never shared between threads
+        self._local = threading.local()
+        self._ydl_instances: List[yt_dlp.YoutubeDL] = []  # every per-thread instance, for close()
+        self._ydl_instances_lock = threading.Lock()
+    
+    def close(self):
+        """Release the extraction threads and YoutubeDL instances; in-flight extractions are abandoned"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._ydl_instances_lock:
+            for ydl in self._ydl_instances:
+                ydl.close()
+            self._ydl_instances.clear()
+    
+    def _thread_ydl(self, overrides: tuple) -> yt_dlp.YoutubeDL:
+        """The calling worker thread's YoutubeDL for a set of option overrides (constructing one loads every extractor)"""
+        instances = getattr(self._local, 'instances', None)
+        if instances is None:
+            instances = self._local.instances = {}
+        ydl = instances.get(overrides)
+        if ydl is None:
+            ydl = instances[overrides] = yt_dlp.YoutubeDL({**config.YDL_BASE_OPTIONS, **dict(overrides)})
+            with self._ydl_instances_lock:
+                self._ydl_instances.append(ydl)
+        return ydl
+    
+    def _extract_blocking(self, overrides: tuple, query: str) -> Optional[dict]:
+        """Runs on a worker thread"""
+        return self._thread_ydl(overrides).extract_info(query, download=False)
+    
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking call on the extraction pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    async def _extract_info(self, query: str, **overrides) -> Optional[dict]:
+        """Run extract_info for query on the extraction pool with the given option overrides"""
+        return await self._run(self._extract_blocking, tuple(sorted(overrides.items())), query)
     
     def _is_playlist_url(self, query: str) -> bool:
         """Check if URL is a playlist, mix, or radio"""
         query_lower = query.lower()
-        # Check for playlist indicators
-        if 'list=' in query_lower:
-            return True
-        if '/playlist' in query_lower:
-            return True
-        if '&list=' in query_lower or '?list=' in query_lower:
+        # Check for playlist indicators ('list=' also covers '?list=' and '&list=')
+        if 'list=' in query_lower or '/playlist' in query_lower:
             return True
         # YouTube mix/radio
-        if 'mix' in query_lower and 'youtube' in query_lower:
-            return True
-        return False
+        return 'mix' in query_lower and 'youtube' in query_lower
     
     async def extract(
         self, 
@@ -70,38 +107,34 @@ class ExtractorService:
         if SPOTIFY_URL_PATTERN.search(query):
             return await self._handle_spotify(query, requester)
         
-        ydl_opts = config.YDL_BASE_OPTIONS.copy()
         is_playlist = self._is_playlist_url(query)
-        
         if is_playlist:
-            ydl_opts['extract_flat'] = 'in_playlist'  # Better for large playlists
-            ydl_opts['noplaylist'] = False
-            ydl_opts['playlistend'] = max_playlist_items
+            # Flat extraction is better for large playlists
+            overrides = {'extract_flat': 'in_playlist', 'noplaylist': False, 'playlistend': max_playlist_items}
         else:
-            ydl_opts['extract_flat'] = False
-            ydl_opts['noplaylist'] = True
+            overrides = {'extract_flat': False, 'noplaylist': True}
+        make_song = Song.from_flat_entry if is_playlist else Song.from_ytdl_info
         
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, query, download=False)
+            info = await self._extract_info(query, **overrides)
+            
+            if info is None:
+                return {'error': 'Could not extract info from URL'}
+            
+            if 'entries' in info:
+                # Playlist/mix
+                songs = []
+                for entry in info['entries']:
+                    if entry:  # Skip None entries (hidden videos)
+                        songs.append(make_song(entry, requester))
                 
-                if info is None:
-                    return {'error': 'Could not extract info from URL'}
+                if not songs:
+                    return {'error': 'No playable videos found in playlist'}
+                return songs
+            else:
+                # Single song
+                return [Song.from_ytdl_info(info, requester)]
                 
-                if 'entries' in info:
-                    # Playlist/mix
-                    songs = []
-                    for entry in info['entries']:
-                        if entry:  # Skip None entries (hidden videos)
-                            songs.append(Song.from_ytdl_info(entry, requester))
-                    
-                    if not songs:
-                        return {'error': 'No playable videos found in playlist'}
-                    return songs
-                else:
-                    # Single song
-                    return [Song.from_ytdl_info(info, requester)]
-                    
         except Exception as e:
             self.logger.error(f"YTDL error: {e}")
             
@@ -118,36 +151,26 @@ class ExtractorService:
             self.logger.error(f"Cannot refresh URL: no webpage_url for {song.title}")
             return None
         
-        ydl_opts = config.YDL_BASE_OPTIONS.copy()
-        ydl_opts['extract_flat'] = False
-        ydl_opts['noplaylist'] = True
-        
         try:
             self.logger.info(f"Refreshing stream URL for: {song.title}")
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, url, download=False)
-                if info:
-                    return Song.from_ytdl_info(info, song.requester)
-                return None
+            info = await self._extract_info(url, extract_flat=False, noplaylist=True)
+            if info:
+                return Song.from_ytdl_info(info, song.requester)
+            return None
         except Exception as e:
             self.logger.error(f"Error refreshing URL: {e}")
             return None
     
     async def search(self, query: str, requester=None, limit: int = 1) -> List[Song]:
         """Search YouTube for songs"""
-        ydl_opts = config.YDL_BASE_OPTIONS.copy()
-        ydl_opts['extract_flat'] = False
-        ydl_opts['noplaylist'] = True
-        
         search_query = f"ytsearch{limit}:{query}"
         
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, search_query, download=False)
-                
-                if info and 'entries' in info and info['entries']:
-                    return [Song.from_ytdl_info(entry, requester) for entry in info['entries'] if entry]
-                return []
+            info = await self._extract_info(search_query, extract_flat=False, noplaylist=True)
+            
+            if info and 'entries' in info and info['entries']:
+                return [Song.from_ytdl_info(entry, requester) for entry in info['entries'] if entry]
+            return []
         except Exception as e:
             self.logger.error(f"Search error: {e}")
             return []
@@ -173,24 +196,32 @@ class ExtractorService:
         self, 
         playlist_url: str, 
         start_index: int,
-        requester=None
-    ) -> List[Song]:
-        """Load remaining items from a playlist (background task)"""
+        requester=None,
+        batch_size: int = 25
+    ) -> AsyncIterator[List[Song]]:
+        """Load remaining items from a playlist (background task), yielding songs in batches"""
         ydl_opts = config.YDL_BASE_OPTIONS.copy()
         ydl_opts['extract_flat'] = 'in_playlist'
         ydl_opts['noplaylist'] = False
-        ydl_opts['playliststart'] = start_index + 1  # 1-indexed
+        # Skip what the initial load already queued (1-indexed)
+        ydl_opts['playliststart'] = start_index + 1
         
         try:
+            # Own instance for the custom start; it is used by a single executor call
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, playlist_url, download=False)
-                
-                if info and 'entries' in info and info['entries']:
-                    return [Song.from_ytdl_info(entry, requester) for entry in info['entries'] if entry]
-                return []
+                # One processed pass: url/url_transparent results (watch?v=…&list=…, mixes) are
+                # followed to the real playlist and every page is fetched once
+                info = await self._run(ydl.extract_info, playlist_url, download=False)
+            
+            entries = [entry for entry in (info or {}).get('entries') or [] if entry]
+            if not entries:
+                self.logger.info(f"No remaining playlist entries after index {start_index}: {playlist_url}")
+                return
+            
+            for i in range(0, len(entries), batch_size):
+                yield [Song.from_flat_entry(entry, requester) for entry in entries[i:i + batch_size]]
         except Exception as e:
             self.logger.error(f"Error loading remaining playlist: {e}")
-            return []
     
     async def _smart_search_fallback(self, failed_query: str, requester=None) -> Union[List[Song], dict]:
         """Try searching when a URL fails"""
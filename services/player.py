@@ -4,9 +4,10 @@ Audio player service
 """
 
 import asyncio
+import enum
 import logging
 import time
-from typing import Callable, Optional
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
 
 import discord
 
@@ -19,6 +20,19 @@ from services.extractor import ExtractorService
 logger = logging.getLogger('music_bot.player')
 
 
+class PlaybackState(enum.Enum):
+    """Voice playback state for a guild"""
+    IDLE = 'idle'
+    PLAYING = 'playing'
+    PAUSED = 'paused'
+
+
+class PlayerStateSnapshot(NamedTuple):
+    """Playback and loop state read together for UI refreshes"""
+    playback: PlaybackState
+    loop_mode: str
+
+
 class PlayerService:
     """Service for audio playback control"""
     
@@ -37,12 +51,40 @@ class PlayerService:
         self._seeking_guilds: set = set()
         # Track intentional disconnects
         self._disconnecting_guilds: set = set()
+        # One reusable after-playback callback per guild
+        self._after_callbacks: Dict[int, Callable] = {}
+        # play_next tasks started from the audio thread, held until they finish
+        self._song_end_tasks: set = set()
+        # Stream URL refresh for the upcoming song, started while the current one plays
+        self._prefetch: Dict[int, Tuple[Song, asyncio.Task]] = {}
+        
+        # Optional hook to refill an empty queue (e.g. autoplay); returns True if songs were added
+        self.on_queue_empty: Optional[Callable[[int], Awaitable[bool]]] = None
+    
+    def _get_after_callback(self, guild_id: int) -> Callable:
+        """Get the after-playback callback for a guild, creating it once"""
+        callback = self._after_callbacks.get(guild_id)
+        if callback is None:
+            def callback(error):
+                if error:
+                    self.logger.error(f"Player error: {error}")
+                # Runs on the audio thread; one plain callback hop, no cross-thread Future to complete
+                self.bot.loop.call_soon_threadsafe(self._start_play_next, guild_id)
+            self._after_callbacks[guild_id] = callback
+        return callback
+    
+    def _start_play_next(self, guild_id: int):
+        """Start play_next on the event loop (scheduled from the audio thread)"""
+        task = asyncio.create_task(self.play_next(guild_id))
+        self._song_end_tasks.add(task)
+        task.add_done_callback(self._song_end_tasks.discard)
     
     def get_voice_client(self, guild_id: int) -> Optional[discord.VoiceClient]:
         """Get voice client for guild"""
         guild = self.bot.get_guild(guild_id)
         if guild:
-            return discord.utils.get(self.bot.voice_clients, guild=guild)
+            # discord.py keys voice clients by guild id; this is a dict lookup, not a scan of bot.voice_clients
+            return guild.voice_client
         return None
     
     async def connect(self, channel: discord.VoiceChannel) -> Optional[discord.VoiceClient]:
@@ -64,8 +106,32 @@ class PlayerService:
         if vc:
             await vc.disconnect()
         
+        self.forget(guild_id)
         self.queue.cleanup_guild(guild_id)
     
+    def forget(self, guild_id: int):
+        """Drop per-connection bookkeeping once the bot has left voice"""
+        self._after_callbacks.pop(guild_id, None)
+        self.cancel_prefetch(guild_id)
+    
+    def _prefetch_next(self, guild_id: int):
+        """Start refreshing the head of the queue if it has no stream URL yet"""
+        queue = self.queue.get_queue(guild_id)
+        if not queue or queue[0].is_url_valid:
+            return
+        song = queue[0]
+        entry = self._prefetch.get(guild_id)
+        if entry and entry[0] is song:
+            return
+        self.cancel_prefetch(guild_id)
+        self._prefetch[guild_id] = (song, asyncio.create_task(self.extractor.refresh_url(song)))
+    
+    def cancel_prefetch(self, guild_id: int):
+        """Drop any in-flight refresh for the upcoming song"""
+        entry = self._prefetch.pop(guild_id, None)
+        if entry:
+            entry[1].cancel()
+    
     def is_intentional_disconnect(self, guild_id: int) -> bool:
         """Check if disconnect was intentional"""
         if guild_id in self._disconnecting_guilds:
@@ -85,11 +151,14 @@ class PlayerService:
         Args:
             guild_id: Guild ID
             song: Song to play
-            after_callback: Callback for when song ends
+            after_callback: Callback for when song ends (defaults to playing the next song)
             
         Returns:
             True if playback started successfully
         """
+        if after_callback is None:
+            after_callback = self._get_after_callback(guild_id)
+        
         vc = self.get_voice_client(guild_id)
         if not vc:
             self.logger.error(f"No voice client for guild {guild_id}")
@@ -97,7 +166,18 @@ class PlayerService:
         
         # Refresh URL if needed
         if not song.is_url_valid:
-            refreshed = await self.extractor.refresh_url(song)
+            refreshed = None
+            entry = self._prefetch.pop(guild_id, None)
+            if entry and entry[0] is song:
+                # Already refreshed (or refreshing) in the background
+                try:
+                    refreshed = await entry[1]
+                except asyncio.CancelledError:
+                    refreshed = None
+            elif entry:
+                entry[1].cancel()
+            if not refreshed:
+                refreshed = await self.extractor.refresh_url(song)
             if not refreshed:
                 self.logger.error(f"Could not get stream URL for: {song.title}")
                 return False
@@ -113,8 +193,9 @@ class PlayerService:
             
             vc.play(source, after=after_callback)
             
-            self.queue.set_song_start_time(guild_id, time.time())
+            self.queue.set_song_start_time(guild_id, time.monotonic())
             self.queue.reset_skip_votes(guild_id)
+            self._prefetch_next(guild_id)
             
             return True
             
@@ -128,7 +209,7 @@ class PlayerService:
         
         Args:
             guild_id: Guild ID
-            after_callback: Callback for when song ends
+            after_callback: Callback for when song ends (defaults to playing the next song)
             
         Returns:
             True if a song was played, False if queue empty
@@ -139,8 +220,12 @@ class PlayerService:
             return False
         
         song = self.queue.get_next(guild_id)
+        if not song and self.on_queue_empty and await self.on_queue_empty(guild_id):
+            song = self.queue.get_next(guild_id)
+        
         if not song:
             self.queue.set_current(guild_id, None)
+            self.queue.clear_now_playing_message(guild_id)
             return False
         
         return await self.play_song(guild_id, song, after_callback)
@@ -168,6 +253,24 @@ class PlayerService:
             return True
         return False
     
+    def get_playback_state(self, guild_id: int) -> PlaybackState:
+        """Get playback state from a single voice client lookup"""
+        vc = self.get_voice_client(guild_id)
+        if vc is None:
+            return PlaybackState.IDLE
+        if vc.is_paused():
+            return PlaybackState.PAUSED
+        if vc.is_playing():
+            return PlaybackState.PLAYING
+        return PlaybackState.IDLE
+    
+    def get_state_snapshot(self, guild_id: int) -> PlayerStateSnapshot:
+        """Get playback state and loop mode in one call"""
+        return PlayerStateSnapshot(
+            self.get_playback_state(guild_id),
+            self.queue.get_loop_mode(guild_id)
+        )
+    
     def is_playing(self, guild_id: int) -> bool:
         """Check if playing"""
         vc = self.get_voice_client(guild_id)
@@ -185,11 +288,14 @@ class PlayerService:
         Args:
             guild_id: Guild ID
             seconds: Position in seconds
-            after_callback: Callback for when song ends
+            after_callback: Callback for when song ends (defaults to playing the next song)
             
         Returns:
             True if seek successful
         """
+        if after_callback is None:
+            after_callback = self._get_after_callback(guild_id)
+        
         vc = self.get_voice_client(guild_id)
         current_song = self.queue.get_current(guild_id)
         
@@ -208,8 +314,9 @@ class PlayerService:
             audio_filter = self.queue.get_filter(guild_id)
             
             ffmpeg_opts = config.get_ffmpeg_options(volume=volume, filter_name=audio_filter)
+            # The shared options are read-only; seeking gets its own copy
             base_before_options = ffmpeg_opts.get('before_options', '')
-            ffmpeg_opts['before_options'] = f"-ss {seconds} {base_before_options}"
+            ffmpeg_opts = {**ffmpeg_opts, 'before_options': f"-ss {seconds} {base_before_options}"}
             
             source = discord.FFmpegOpusAudio(current_song.url, **ffmpeg_opts)
             
@@ -217,7 +324,7 @@ class PlayerService:
             self._seeking_guilds.add(guild_id)
             
             # Update start time to account for seek position
-            self.queue.set_song_start_time(guild_id, time.time() - seconds)
+            self.queue.set_song_start_time(guild_id, time.monotonic() - seconds)
             
             vc.stop()
             vc.play(source, after=after_callback)
@@ -241,7 +348,7 @@ class PlayerService:
         Args:
             guild_id: Guild ID
             filter_name: Filter to apply
-            after_callback: Callback for when song ends
+            after_callback: Callback for when song ends (defaults to playing the next song)
             
         Returns:
             True if filter applied
@@ -251,7 +358,7 @@ class PlayerService:
         # Calculate current position
         start_time = self.queue.get_song_start_time(guild_id)
         if start_time:
-            current_pos = int(time.time() - start_time)
+            current_pos = int(time.monotonic() - start_time)
             return await self.seek(guild_id, current_pos, after_callback)
         
         return False
@@ -260,5 +367,5 @@ class PlayerService:
         """Get current playback position in seconds"""
         start_time = self.queue.get_song_start_time(guild_id)
         if start_time:
-            return int(time.time() - start_time)
+            return int(time.monotonic() - start_time)
         return 0
@@ -4,16 +4,29 @@ Queue management service
 """
 
 import logging
-import random
-from typing import Dict, List, Optional
+from collections import deque
+from itertools import count
+from typing import Deque, Dict, List, Optional, Tuple
 
+import config
 from models.song import Song
-from models.guild_state import GuildState
+from models.guild_state import GuildState, QueueSnapshot
+from utils.cache import SettingsCache
 from utils.database import RedisManager
 
 
 logger = logging.getLogger('music_bot.queue')
 
+# Settings read on hot paths (every message / voice event), with their defaults
+CACHED_SETTINGS = {
+    'request_channel_id': None,
+    'is_247_mode': False,
+    'autoplay_enabled': False,
+}
+
+# Queue versions are drawn bot-wide, so a guild whose state was dropped and rebuilt never repeats one
+_queue_versions = count(1)
+
 
 class QueueService:
     """Service for managing song queues per guild"""
@@ -22,6 +35,7 @@ class QueueService:
         self.logger = logger
         self.db = db
         self._states: Dict[int, GuildState] = {}
+        self._settings = SettingsCache(ttl=config.SETTINGS_CACHE_TTL)
     
     def get_state(self, guild_id: int) -> GuildState:
         """Get or create guild state"""
@@ -31,25 +45,57 @@ class QueueService:
             self._load_from_redis(guild_id)
         return self._states[guild_id]
     
+    def get_states_bulk(self, guild_ids: List[int]) -> Dict[int, GuildState]:
+        """Get or create states for many guilds, loading missing ones in one Redis round-trip"""
+        missing = [g for g in guild_ids if g not in self._states]
+        if missing:
+            stored = self.db.load_guilds(missing)
+            for guild_id in missing:
+                self._states[guild_id] = GuildState(guild_id=guild_id)
+                queue_data, settings = stored.get(guild_id, ([], {}))
+                self._apply_stored(guild_id, queue_data, settings)
+        return {g: self._states[g] for g in guild_ids}
+    
     def _load_from_redis(self, guild_id: int):
         """Load queue and settings from Redis"""
+        self._apply_stored(
+            guild_id,
+            self.db.load_queue(guild_id),
+            self.db.get_settings(guild_id)
+        )
+    
+    def _apply_stored(self, guild_id: int, queue_data: List[dict], settings: dict):
+        """Populate guild state from persisted queue and settings"""
         state = self._states[guild_id]
+        state.queue_version = next(_queue_versions)
         
         # Load queue
-        queue_data = self.db.load_queue(guild_id)
         if queue_data:
-            state.queue = [Song.from_dict(s) for s in queue_data]
+            state.queue = deque(Song.from_dict(s) for s in queue_data)
             self.logger.info(f"Loaded {len(state.queue)} songs from Redis for guild {guild_id}")
         
         # Load settings
-        state.volume = self.db.get_volume(guild_id)
-        state.loop_mode = self.db.get_loop_mode(guild_id)
-        state.audio_filter = self.db.get_filter(guild_id)
+        state.volume = settings.get('volume', 1.0)
+        state.loop_mode = settings.get('loop_mode', 'off')
+        state.audio_filter = settings.get('filter', 'off')
+        
+        # Prime the hot-path settings cache from the same read
+        for field, default in CACHED_SETTINGS.items():
+            self._settings.set(guild_id, field, settings.get(field, default))
+    
+    def _get_cached_setting(self, guild_id: int, field: str):
+        """Read a hot-path setting, consulting Redis only on cache miss"""
+        return self._settings.get_or_load(
+            guild_id,
+            field,
+            lambda: self.db.get_settings(guild_id).get(field, CACHED_SETTINGS[field])
+        )
     
     def _save_queue_to_redis(self, guild_id: int):
         """Save queue to Redis"""
         state = self._states.get(guild_id)
         if state:
+            state.queue_version = next(_queue_versions)
             queue_data = [s.to_dict() for s in state.queue]
             self.db.save_queue(guild_id, queue_data)
     
@@ -80,6 +126,7 @@ class QueueService:
         """Clear the queue"""
         state = self.get_state(guild_id)
         state.clear_queue()
+        state.queue_version = next(_queue_versions)
         self.db.clear_queue(guild_id)
     
     def shuffle(self, guild_id: int):
@@ -88,13 +135,13 @@ class QueueService:
         state.shuffle_queue()
         self._save_queue_to_redis(guild_id)
     
-    def move(self, guild_id: int, from_pos: int, to_pos: int) -> bool:
-        """Move song from one position to another (0-based)"""
+    def move(self, guild_id: int, from_pos: int, to_pos: int) -> Optional[Song]:
+        """Move song from one position to another (0-based), return moved song"""
         state = self.get_state(guild_id)
-        success = state.move_song(from_pos, to_pos)
-        if success:
+        song = state.move_song(from_pos, to_pos)
+        if song:
             self._save_queue_to_redis(guild_id)
-        return success
+        return song
     
     def get_next(self, guild_id: int) -> Optional[Song]:
         """Get next song based on loop mode"""
@@ -114,11 +161,32 @@ class QueueService:
         """Set current song"""
         state = self.get_state(guild_id)
         state.current_song = song
+        state.queue_version = next(_queue_versions)
     
-    def get_queue(self, guild_id: int) -> List[Song]:
+    def get_queue(self, guild_id: int) -> Deque[Song]:
         """Get queue for guild"""
         return self.get_state(guild_id).queue
     
+    def total_queue_length(self, guild_ids: List[int]) -> int:
+        """Total queued songs across guilds, loading any missing states in one round-trip"""
+        return sum(len(state.queue) for state in self.get_states_bulk(guild_ids).values())
+    
+    def queue_length(self, guild_id: int) -> int:
+        """Get number of queued songs"""
+        return len(self.get_state(guild_id).queue)
+    
+    def get_snapshot(self, guild_id: int) -> QueueSnapshot:
+        """Get current song, queue and playback settings in a single state lookup"""
+        state = self.get_state(guild_id)
+        return QueueSnapshot(
+            current_song=state.current_song,
+            queue=state.queue,
+            loop_mode=state.loop_mode,
+            volume=state.volume,
+            queue_length=len(state.queue),
+            queue_version=state.queue_version
+        )
+    
     # --- Settings ---
     
     def set_volume(self, guild_id: int, volume: float):
@@ -162,13 +230,13 @@ class QueueService:
     
     # --- Vote Skip ---
     
-    def add_skip_vote(self, guild_id: int, user_id: int) -> bool:
-        """Add skip vote, return True if new vote"""
-        state = self.get_state(guild_id)
-        if user_id in state.vote_skip_users:
-            return False
-        state.vote_skip_users.add(user_id)
-        return True
+    def add_skip_vote(self, guild_id: int, user_id: int) -> Tuple[bool, int]:
+        """Add skip vote, return (True if new vote, total votes)"""
+        votes = self.get_state(guild_id).vote_skip_users
+        if user_id in votes:
+            return False, len(votes)
+        votes.add(user_id)
+        return True, len(votes)
     
     def get_skip_votes(self, guild_id: int) -> int:
         """Get number of skip votes"""
@@ -217,14 +285,11 @@ class QueueService:
         state = self.get_state(guild_id)
         state.is_247_mode = enabled
         self.db.set_247_mode(guild_id, enabled)
+        self._settings.set(guild_id, 'is_247_mode', enabled)
     
     def get_247_mode(self, guild_id: int) -> bool:
         """Get 24/7 mode"""
-        state = self.get_state(guild_id)
-        if not hasattr(state, '_247_loaded'):
-            state.is_247_mode = self.db.get_247_mode(guild_id)
-            state._247_loaded = True
-        return state.is_247_mode
+        return self._get_cached_setting(guild_id, 'is_247_mode')
     
     # --- Auto-play ---
     
@@ -233,24 +298,22 @@ class QueueService:
         state = self.get_state(guild_id)
         state.autoplay_enabled = enabled
         self.db.set_autoplay(guild_id, enabled)
+        self._settings.set(guild_id, 'autoplay_enabled', enabled)
     
     def get_autoplay(self, guild_id: int) -> bool:
         """Get auto-play mode"""
-        state = self.get_state(guild_id)
-        if not hasattr(state, '_autoplay_loaded'):
-            state.autoplay_enabled = self.db.get_autoplay(guild_id)
-            state._autoplay_loaded = True
-        return state.autoplay_enabled
+        return self._get_cached_setting(guild_id, 'autoplay_enabled')
     
     # --- Request Channel ---
     
     def set_request_channel(self, guild_id: int, channel_id: Optional[int]):
         """Set song request channel"""
         self.db.set_request_channel(guild_id, channel_id)
+        self._settings.set(guild_id, 'request_channel_id', channel_id)
     
     def get_request_channel(self, guild_id: int) -> Optional[int]:
         """Get song request channel"""
-        return self.db.get_request_channel(guild_id)
+        return self._get_cached_setting(guild_id, 'request_channel_id')
     
     # --- Saved Playlists ---
     
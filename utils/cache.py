@@ -6,11 +6,14 @@ Caching utilities for the Discord Music Bot
 import time
 import json
 import asyncio
-from typing import Any, Optional, Dict, Tuple
+from typing import Any, Callable, Optional, Dict, Tuple
 from collections import OrderedDict
 from .database import RedisManager
 import os
 
+# Seconds between full expired-entry sweeps triggered by inserts into a full in-memory cache
+EXPIRED_SWEEP_INTERVAL = 60
+
 class SimpleCache:
     """
     Cache implementation that uses Redis if available, falling back to in-memory.
@@ -33,6 +36,8 @@ class SimpleCache:
         self._lock = asyncio.Lock()
         self._hits = 0
         self._misses = 0
+        # Earliest time a full cache may sweep expired entries again on insert
+        self._next_sweep = 0.0
     
     async def get(self, key: str) -> Optional[Any]:
         """
@@ -93,7 +98,12 @@ class SimpleCache:
                 self._cache.move_to_end(key)
             else:
                 if len(self._cache) >= self.max_size:
-                    self._cache.popitem(last=False)
+                    # Only a full cache is swept, and at most once per EXPIRED_SWEEP_INTERVAL, so inserts
+                    # at capacity stay O(1); between sweeps the LRU entry is evicted, expired or not
+                    if created >= self._next_sweep:
+                        self._remove_expired(created)
+                    if len(self._cache) >= self.max_size:
+                        self._cache.popitem(last=False)
                 
                 self._cache[key] = (value, expiry, created)
     
@@ -139,15 +149,18 @@ class SimpleCache:
             return
 
         async with self._lock:
-            current_time = time.time()
-            keys_to_delete = []
-            
-            for key, (_, expiry, _) in self._cache.items():
-                if expiry and current_time > expiry:
-                    keys_to_delete.append(key)
-            
-            for key in keys_to_delete:
-                del self._cache[key]
+            self._remove_expired(time.time())
+    
+    def _remove_expired(self, current_time: float):
+        """Drop expired in-memory entries; caller holds the lock"""
+        self._next_sweep = current_time + EXPIRED_SWEEP_INTERVAL
+        keys_to_delete = [
+            key for key, (_, expiry, _) in self._cache.items()
+            if expiry and current_time > expiry
+        ]
+        
+        for key in keys_to_delete:
+            del self._cache[key]
     
     def size(self) -> int:
         if self.redis.is_connected():
@@ -155,14 +168,16 @@ class SimpleCache:
         return len(self._cache)
     
     def get_stats(self) -> Dict[str, Any]:
-        total_requests = self._hits + self._misses
-        hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
+        # Snapshot the counters once so every derived figure agrees; no lock needed
+        hits, misses = self._hits, self._misses
+        total_requests = hits + misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
         
         return {
             'size': self.size(),
             'max_size': self.max_size,
-            'hits': self._hits,
-            'misses': self._misses,
+            'hits': hits,
+            'misses': misses,
             'total_requests': total_requests,
             'hit_rate': f"{hit_rate:.1f}%",
             'backend': 'redis' if self.redis.is_connected() else 'memory'
@@ -209,3 +224,43 @@ class GuildCache:
             'stream_urls': self.stream_url_cache.get_stats(),
             'lyrics': self.lyrics_cache.get_stats()
         }
+
+
+class SettingsCache:
+    """
+    Short-lived in-process cache for per-guild settings read on hot paths
+    """
+    
+    def __init__(self, ttl: float = 30.0):
+        """
+        Initialize the settings cache
+        
+        Args:
+            ttl: Seconds before a cached value is re-read from its source
+        """
+        self.ttl = ttl
+        self._entries: Dict[int, Dict[str, Tuple[Any, float]]] = {}
+    
+    def get_or_load(self, guild_id: int, field: str, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached setting, calling loader on miss or expiry
+        """
+        entry = self._entries.get(guild_id, {}).get(field)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        
+        value = loader()
+        self.set(guild_id, field, value)
+        return value
+    
+    def set(self, guild_id: int, field: str, value: Any):
+        """
+        Store a setting (write-through after persisting it)
+        """
+        self._entries.setdefault(guild_id, {})[field] = (value, time.monotonic() + self.ttl)
+    
+    def invalidate(self, guild_id: int):
+        """
+        Drop every cached setting for a guild
+        """
+        self._entries.pop(guild_id, None)
@@ -4,11 +4,45 @@ import os
 import logging
 from typing import List, Optional, Dict
 
+import config
+
+# Faster JSON codec when available; payloads stay plain JSON text either way
+try:
+    import orjson
+
+    def _dumps(value) -> str:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# One connection pool per (host, port, db), shared by every RedisManager
+_POOLS: Dict[tuple, redis.BlockingConnectionPool] = {}
+
+
+def _get_pool(host, port, db) -> redis.BlockingConnectionPool:
+    key = (host, port, db)
+    pool = _POOLS.get(key)
+    if pool is None:
+        pool = redis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            max_connections=config.REDIS_MAX_CONNECTIONS,
+            client_name=config.REDIS_CLIENT_NAME,
+            decode_responses=True
+        )
+        _POOLS[key] = pool
+    return pool
+
+
 class RedisManager:
     def __init__(self, host='redis', port=6379, db=0):
         self.logger = logging.getLogger('music_bot.database')
         try:
-            self.client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+            self.client = redis.Redis(connection_pool=_get_pool(host, port, db))
             self.client.ping()
             self.logger.info(f"Connected to Redis at {host}:{port}")
         except redis.ConnectionError as e:
@@ -22,13 +56,13 @@ class RedisManager:
     def get_settings(self, guild_id):
         if not self.client: return {}
         data = self.client.get(f"settings:{guild_id}")
-        return json.loads(data) if data else {}
+        return _loads(data) if data else {}
 
     def set_setting(self, guild_id, key, value):
         if not self.client: return
         settings = self.get_settings(guild_id)
         settings[key] = value
-        self.client.set(f"settings:{guild_id}", json.dumps(settings))
+        self.client.set(f"settings:{guild_id}", _dumps(settings))
 
     def get_volume(self, guild_id):
         settings = self.get_settings(guild_id)
@@ -78,17 +112,37 @@ class RedisManager:
     # --- Queue Persistence ---
     def save_queue(self, guild_id, queue):
         if not self.client: return
-        self.client.set(f"queue:{guild_id}", json.dumps(queue))
+        self.client.set(f"queue:{guild_id}", _dumps(queue))
 
     def load_queue(self, guild_id):
         if not self.client: return []
         data = self.client.get(f"queue:{guild_id}")
-        return json.loads(data) if data else []
+        return _loads(data) if data else []
     
     def clear_queue(self, guild_id):
         if not self.client: return
         self.client.delete(f"queue:{guild_id}")
 
+    # --- Bulk Loading ---
+    def load_guilds(self, guild_ids) -> Dict[int, tuple]:
+        """Load (queue, settings) for many guilds in a single pipelined round-trip"""
+        if not self.client: return {}
+        guild_ids = list(guild_ids)
+        pipe = self.client.pipeline(transaction=False)
+        for guild_id in guild_ids:
+            pipe.get(f"queue:{guild_id}")
+            pipe.get(f"settings:{guild_id}")
+        results = pipe.execute()
+
+        data = {}
+        for i, guild_id in enumerate(guild_ids):
+            queue_raw, settings_raw = results[2 * i], results[2 * i + 1]
+            data[guild_id] = (
+                _loads(queue_raw) if queue_raw else [],
+                _loads(settings_raw) if settings_raw else {},
+            )
+        return data
+
     # --- Saved Playlists ---
     def save_playlist(self, guild_id, name: str, songs: List[dict]):
         """Save a playlist for a guild"""
@@ -96,7 +150,7 @@ class RedisManager:
         key = f"playlists:{guild_id}"
         playlists = self.get_all_playlists(guild_id)
         playlists[name] = songs
-        self.client.set(key, json.dumps(playlists))
+        self.client.set(key, _dumps(playlists))
 
     def load_playlist(self, guild_id, name: str) -> Optional[List[dict]]:
         """Load a saved playlist"""
@@ -109,7 +163,7 @@ class RedisManager:
         playlists = self.get_all_playlists(guild_id)
         if name in playlists:
             del playlists[name]
-            self.client.set(f"playlists:{guild_id}", json.dumps(playlists))
+            self.client.set(f"playlists:{guild_id}", _dumps(playlists))
             return True
         return False
 
@@ -117,7 +171,7 @@ class RedisManager:
         """Get all saved playlists for a guild"""
         if not self.client: return {}
         data = self.client.get(f"playlists:{guild_id}")
-        return json.loads(data) if data else {}
+        return _loads(data) if data else {}
 
     def list_playlists(self, guild_id) -> List[str]:
         """List all playlist names for a guild"""
@@ -127,8 +181,8 @@ class RedisManager:
     def cache_get(self, key):
         if not self.client: return None
         val = self.client.get(f"cache:{key}")
-        return json.loads(val) if val else None
+        return _loads(val) if val else None
 
     def cache_set(self, key, value, ttl=3600):
         if not self.client: return
-        self.client.setex(f"cache:{key}", ttl, json.dumps(value))
+        self.client.setex(f"cache:{key}", ttl, _dumps(value))
@@ -4,31 +4,45 @@ Helper functions for the Discord Music Bot
 """
 
 import re
+from functools import lru_cache
 from typing import Optional, Union
 import datetime
 
 
+# Assumed length (seconds) of a song whose duration is unknown, for queue estimates
+UNKNOWN_DURATION_ESTIMATE = 180
+
+_INF = float('inf')
+
+
 def format_duration(seconds: Optional[int]) -> str:
     """
     Format duration in seconds to human-readable format (HH:MM:SS or MM:SS)
     
     Args:
-        seconds: Duration in seconds
+        seconds: Duration in seconds. Ints and floats (truncated) are accepted, as are
+            integer strings such as "245" from older stored queues; bools count as 0/1
+            like any int.
     
     Returns:
-        Formatted duration string
+        Formatted duration string, or "N/A" for None, negative, NaN/inf or non-numeric input
     """
-    if seconds is None:
-        return "N/A"
-    
-    try:
-        seconds = int(seconds)
-    except (ValueError, TypeError):
-        return "N/A"
-    
-    if seconds < 0:
+    if isinstance(seconds, str):
+        # Older Redis payloads stored durations as strings; same int() parsing as before
+        try:
+            seconds = int(seconds)
+        except ValueError:
+            return "N/A"
+    # Plain type/range checks for the common numeric case; the chained compare also rejects NaN and inf
+    if not isinstance(seconds, (int, float)) or not 0 <= seconds < _INF:
         return "N/A"
     
+    return _format_hms(int(seconds))
+
+
+@lru_cache(maxsize=4096)
+def _format_hms(seconds: int) -> str:
+    """Format a validated, non-negative whole number of seconds (memoized)"""
     hours, remainder = divmod(seconds, 3600)
     minutes, secs = divmod(remainder, 60)
     
@@ -105,15 +119,19 @@ def create_progress_bar(current: int, total: int, length: int = 10, filled: str
         Progress bar string
     """
     if total <= 0 or current < 0:
-        return f"[{empty * length}]"
+        return _progress_bar(0, length, filled, empty)
     
     if current > total:
         current = total
     
     filled_length = int((current / total) * length)
-    bar = filled * filled_length + empty * (length - filled_length)
-    
-    return f"[{bar}]"
+    return _progress_bar(filled_length, length, filled, empty)
+
+
+@lru_cache(maxsize=256)
+def _progress_bar(filled_length: int, length: int, filled: str, empty: str) -> str:
+    """Build a bar string; only length + 1 distinct bars exist per style, so memoize them"""
+    return f"[{filled * filled_length}{empty * (length - filled_length)}]"
 
 
 def format_time_until(position_in_queue: int, current_song_remaining: int, queue_songs: list) -> str:
@@ -141,8 +159,7 @@ def format_time_until(position_in_queue: int, current_song_remaining: int, queue
             if duration:
                 total_seconds += duration
             else:
-                # Unknown duration, estimate 3 minutes
-                total_seconds += 180
+                total_seconds += UNKNOWN_DURATION_ESTIMATE
     
     return f"~{format_duration(total_seconds)}"
 
@@ -157,16 +174,9 @@ def calculate_total_queue_duration(queue_songs: list) -> int:
     Returns:
         Total duration in seconds
     """
-    total = 0
-    for song in queue_songs:
-        duration = song.get('duration', 0)
-        if duration:
-            total += duration
-        else:
-            # Unknown duration, estimate 3 minutes
-            total += 180
-    
-    return total
+    # Local binding keeps the module-global lookup out of the per-song loop
+    estimate = UNKNOWN_DURATION_ESTIMATE
+    return sum(song.get('duration') or estimate for song in queue_songs)
 
 
 def sanitize_url(url: str) -> Optional[str]: